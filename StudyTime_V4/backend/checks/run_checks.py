@@ -5,9 +5,12 @@ Works on Windows, Linux, and macOS
 Run with: python run_checks.py
 """
 
+import py_compile
+import shutil
 import subprocess
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Colors for terminal output
@@ -19,6 +22,9 @@ class Colors:
     BOLD = '\033[1m'
     END = '\033[0m'
 
+# Looked up once; None when pip is not on PATH
+PIP = shutil.which("pip")
+
 # Disable colors on Windows unless using Windows Terminal
 if os.name == 'nt' and not os.environ.get('WT_SESSION'):
     Colors.GREEN = Colors.RED = Colors.YELLOW = Colors.BLUE = Colors.BOLD = Colors.END = ''
@@ -39,24 +45,48 @@ def print_check(name, status, message=""):
     if message:
         print(f"  {message}")
 
-def run_command(command, capture_output=True):
-    """Run a command and return success status"""
+def run_command(argv, capture_output=True):
+    """
+    Run a command and return success status
+    
+    argv is executed directly (no intermediate shell). Python scripts are run
+    with sys.executable so they use the same interpreter as this check.
+    """
     try:
         if capture_output:
             result = subprocess.run(
-                command,
-                shell=True,
+                argv,
                 capture_output=True,
                 text=True,
                 timeout=10
             )
             return result.returncode == 0, result.stdout, result.stderr
         else:
-            result = subprocess.run(command, shell=True, timeout=10)
+            result = subprocess.run(argv, timeout=10)
             return result.returncode == 0, "", ""
     except Exception as e:
         return False, "", str(e)
 
+def run_database_checks():
+    """
+    Run the checks that touch studytime.db one after another (init must come
+    before check/info, and verify_fix.py also creates tables)
+    """
+    results = {}
+    for step in ("init", "check", "info"):
+        results[step] = run_command([sys.executable, "database.py", step])
+    if Path("verify_fix.py").exists():
+        results["verify"] = run_command([sys.executable, "verify_fix.py"])
+    return results
+
+def check_syntax(filename):
+    """Byte-compile a file in this interpreter and return (ok, error)"""
+    try:
+        py_compile.compile(filename, doraise=True)
+        return True, ""
+    except py_compile.PyCompileError as e:
+        return False, str(e)
+
 def check_python_import(module):
     """Check if a Python module can be imported"""
     try:
@@ -71,6 +101,15 @@ def main():
     checks_passed = 0
     checks_failed = 0
     
+    required_files = ["main.py", "database.py", "models.py", "scheduler.py"]
+    
+    # Every subprocess check is started up front so interpreter start-up
+    # overlaps; results are still reported in section order below
+    executor = ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) + 4))
+    pip_future = executor.submit(run_command, [PIP, "--version"]) if PIP else None
+    db_future = executor.submit(run_database_checks)
+    executor.shutdown(wait=False)
+    
     # 1. Environment Checks
     print_section("1. Environment Checks")
     
@@ -85,7 +124,7 @@ def main():
         checks_failed += 1
     
     # pip
-    pip_ok, _, _ = run_command("pip --version")
+    pip_ok = pip_future is not None and pip_future.result()[0]
     print_check("pip installed", pip_ok)
     if pip_ok:
         checks_passed += 1
@@ -123,8 +162,6 @@ def main():
     # 3. File Structure
     print_section("3. File Structure")
     
-    required_files = ["main.py", "database.py", "models.py", "scheduler.py"]
-    
     for filename in required_files:
         exists = Path(filename).exists()
         print_check(f"{filename} exists", exists)
@@ -138,7 +175,8 @@ def main():
     
     # Initialize database
     print(f"{Colors.BLUE}▶ Initializing database...{Colors.END}")
-    db_init_ok, stdout, stderr = run_command("python database.py init")
+    db_results = db_future.result()
+    db_init_ok, stdout, stderr = db_results["init"]
     print_check("Database initialization", db_init_ok)
     if db_init_ok:
         checks_passed += 1
@@ -148,7 +186,7 @@ def main():
             print(f"  Error: {stderr[:200]}")
     
     # Check connection
-    db_check_ok, _, _ = run_command("python database.py check")
+    db_check_ok, _, _ = db_results["check"]
     print_check("Database connection", db_check_ok)
     if db_check_ok:
         checks_passed += 1
@@ -156,7 +194,7 @@ def main():
         checks_failed += 1
     
     # Get info
-    db_info_ok, _, _ = run_command("python database.py info")
+    db_info_ok, _, _ = db_results["info"]
     print_check("Database info retrieval", db_info_ok)
     if db_info_ok:
         checks_passed += 1
@@ -166,8 +204,8 @@ def main():
     # 5. SQLAlchemy 2.0 Compatibility
     print_section("5. SQLAlchemy 2.0 Compatibility")
     
-    if Path("verify_fix.py").exists():
-        verify_ok, _, _ = run_command("python verify_fix.py")
+    if "verify" in db_results:
+        verify_ok, _, _ = db_results["verify"]
         print_check("SQLAlchemy text() fix verified", verify_ok)
         if verify_ok:
             checks_passed += 1
@@ -181,7 +219,7 @@ def main():
     
     for filename in required_files:
         if Path(filename).exists():
-            syntax_ok, _, _ = run_command(f"python -m py_compile {filename}")
+            syntax_ok, _ = check_syntax(filename)
             print_check(f"{filename} syntax", syntax_ok)
             if syntax_ok:
                 checks_passed += 1
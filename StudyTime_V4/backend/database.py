@@ -1,9 +1,8 @@
 from uuid import uuid4
 from sqlalchemy import Column, DateTime
 from datetime import datetime
-from sqlalchemy import Boolean, Column, ForeignKey, String, create_engine, event, text
+from sqlalchemy import Boolean, Column, ForeignKey, String, create_engine, event, lambda_stmt, select, text
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
 from contextlib import contextmanager
 import logging
 from pathlib import Path
@@ -26,28 +25,63 @@ DATABASE_URL = "sqlite:///studytime.db"
 db_path = Path("studytime.db")
 db_path.parent.mkdir(parents=True, exist_ok=True)
 
-# Create engine with proper SQLite settings
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    echo=False,
-    future=True
+# Per-connection SQLite settings: WAL lets readers run alongside the writer,
+# synchronous=NORMAL is durable under WAL, and a 64 MB page cache plus
+# 256 MB of mmap keep hot pages out of read() syscalls
+SQLITE_PRAGMAS = (
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
 )
 
 
-# Enable foreign key support for SQLite
-@event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_conn, connection_record):
     """Enable foreign key constraints and WAL mode for SQLite"""
     cursor = dbapi_conn.cursor()
     try:
-        cursor.execute("PRAGMA foreign_keys=ON")
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
         cursor.close()
     except Exception as e:
         logger.error(f"Error setting SQLite pragmas: {e}")
         cursor.close()
 
 
+# Connection pool settings shared by every engine we build
+POOL_SETTINGS = {
+    "pool_size": 10,
+    "max_overflow": 20,
+    "pool_timeout": 30,
+    "pool_recycle": 1800,
+    "pool_pre_ping": True,
+}
+
+
+def create_optimized_engine(url: str, **kwargs):
+    """
+    Create an engine with a tuned connection pool.
+    
+    SQLite keeps a QueuePool (not StaticPool): a single shared connection
+    would interleave transactions from concurrent requests.
+    """
+    options = dict(POOL_SETTINGS, echo=False, future=True)
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False}
+    options.update(kwargs)
+    new_engine = create_engine(url, **options)
+    
+    if new_engine.dialect.name == "sqlite":
+        event.listen(new_engine, "connect", set_sqlite_pragma)
+    return new_engine
+
+
+# Create engine with proper SQLite settings
+engine = create_optimized_engine(DATABASE_URL)
+
+
 # Session factory
 SessionLocal = sessionmaker(
     bind=engine,
@@ -64,6 +98,10 @@ def init_db():
     try:
         logger.info("Initializing database tables...")
         Base.metadata.create_all(bind=engine)
+        # create_all skips tables that already exist, so add any new indexes
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
         logger.info("✓ Database tables created successfully")
         return True
     except Exception as e:
@@ -267,6 +305,14 @@ def get_upcoming_tasks(db: Session, limit: int = 10):
         return []
 
 
+def owned_rows_stmt(model, user_id: str):
+    """
+    SELECT of a user's rows of `model`, built as a lambda statement so its
+    SQL is compiled once per model and only the user_id bind changes.
+    """
+    return lambda_stmt(lambda: select(model).where(model.user_id == user_id))
+
+
 def check_db_connection():
     try:
         with get_db_context() as db:
@@ -306,6 +352,7 @@ def get_db_info():
 # Export commonly used items
 __all__ = [
     'engine',
+    'create_optimized_engine',
     'SessionLocal',
     'get_db',
     'get_db_context',
@@ -317,6 +364,7 @@ __all__ = [
     'get_active_tasks',
     'mark_task_complete',
     'get_upcoming_tasks',
+    'owned_rows_stmt',
     'get_db_info'
 ]
 
@@ -1,27 +1,48 @@
 from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse, StreamingResponse, RedirectResponse
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse, StreamingResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel, Field, validator
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy.orm import Session, defer
+from sqlalchemy import text, delete, update
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, date
+from functools import lru_cache
 import os
 import logging
 from pathlib import Path
+from types import MappingProxyType
 from fastapi import FastAPI, HTTPException, Depends, Request, Cookie
 from typing import Optional
 import auth  # Import your new auth module
 
 # Import database and models
-from database import get_db, init_db, check_db_connection, DatabaseManager
+from database import get_db, init_db, check_db_connection, DatabaseManager, owned_rows_stmt
 from models import Course, Task, Break, Job, Commute, User, UserPreferences, ScheduledEvent
 
 # Import updated scheduler
 import scheduler
 
+# Per-user tables wiped by /api/clear-all (children before parents)
+_CLEARABLE_MODELS = (ScheduledEvent, Task, Course, Break, Job, Commute)
+
+# Generated events with these statuses are saved to the database
+_PERSISTED_EVENT_STATUSES = frozenset({"scheduled", "incomplete", "exam"})
+
+# Fields a client may change on a scheduled event
+_EDITABLE_EVENT_FIELDS = ("date", "start", "end", "duration", "title")
+
+# PDF export is optional (requires reportlab)
+try:
+    from pdfgeneration import PDFScheduleGenerator
+except ImportError:
+    PDFScheduleGenerator = None
+
+# The generator holds no per-request state, so one instance serves every request
+_PDF_GENERATOR = PDFScheduleGenerator() if PDFScheduleGenerator is not None else None
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -29,19 +50,76 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Default scheduling preferences for users who haven't saved any yet
+_DEFAULT_PREFERENCES = MappingProxyType({
+    "wake": "08:00",
+    "sleep": "23:00",
+    "timezone": "America/New_York",
+    "maxStudyHours": 6,
+    "sessionLength": 60,
+    "breakDuration": 15,
+    "betweenClasses": 30,
+    "afterSchool": 120,
+    "urgencyMode": "balanced",
+    "studyTime": "afternoon",
+    "autoSplit": True,
+    "prioritizeHard": True,
+    "weekendStudy": True,
+    "deadlineBuffer": 12,
+    "lunchStart": "12:00",
+    "lunchEnd": "13:00",
+    "dinnerStart": "18:00",
+    "dinnerEnd": "19:00",
+    "autoMeals": True,
+})
+
+# Serialize responses with orjson when it's available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DefaultResponse = ORJSONResponse if orjson else JSONResponse
+
+
+def _rows_response(rows):
+    """
+    Serialize model rows for list endpoints.
+    
+    With orjson the rows go out as DTO dataclasses encoded in C (datetimes
+    included); otherwise fall back to the regular to_dict() path.
+    """
+    if orjson is None:
+        return [row.to_dict() for row in rows]
+    return Response(
+        orjson.dumps([row.to_dto() for row in rows]),
+        media_type="application/json",
+    )
+
 app = FastAPI(
     title="StudyTime API",
     description="Smart study scheduling API with personalization",
-    version="3.0.0"
+    version="3.0.0",
+    default_response_class=DefaultResponse
 )
 
-# CORS Middleware
+# CORS Middleware - the frontend is served same-origin, so only list
+# extra origins explicitly (comma-separated STUDYTIME_CORS_ORIGINS)
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get(
+        "STUDYTIME_CORS_ORIGINS", "http://localhost:8000,http://127.0.0.1:8000"
+    ).split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PATCH", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 # Setup templates directory
@@ -344,7 +422,7 @@ def get_courses(
     """Get all courses for current user"""
     user_id = current_user["user_id"]  # ✅ ADD THIS
     courses = db.query(Course).filter(Course.user_id == user_id).all()  # ✅ FILTER BY USER
-    return [course.to_dict() for course in courses]
+    return _rows_response(courses)
 
 
 @app.post("/api/courses", response_model=Dict)
@@ -404,7 +482,7 @@ def get_tasks(
     if completed is not None:
         query = query.filter(Task.completed == completed)
     tasks = query.all()
-    return [task.to_dict() for task in tasks]
+    return _rows_response(tasks)
 
 
 @app.post("/api/tasks", response_model=Dict)
@@ -484,7 +562,7 @@ def get_breaks(
     """Get all breaks for current user"""
     user_id = current_user["user_id"]  # ✅ ADD THIS
     breaks = db.query(Break).filter(Break.user_id == user_id).all()  # ✅ FILTER
-    return [b.to_dict() for b in breaks]
+    return _rows_response(breaks)
 
 
 @app.post("/api/breaks", response_model=Dict)
@@ -540,7 +618,7 @@ def get_jobs(
     """Get all jobs for current user"""
     user_id = current_user["user_id"]  # ✅ ADD THIS
     jobs = db.query(Job).filter(Job.user_id == user_id).all()  # ✅ FILTER
-    return [job.to_dict() for job in jobs]
+    return _rows_response(jobs)
 
 
 @app.post("/api/jobs", response_model=Dict)
@@ -602,28 +680,7 @@ def get_preferences(
         
         if not prefs:
             # Return defaults
-            return {
-                "name": None,
-                "timezone": "America/New_York",
-                "wake": "08:00",
-                "sleep": "23:00",
-                "maxStudyHours": 6,
-                "sessionLength": 60,
-                "breakDuration": 15,
-                "betweenClasses": 30,
-                "afterSchool": 120,
-                "urgencyMode": "balanced",
-                "studyTime": "afternoon",
-                "autoSplit": True,
-                "prioritizeHard": True,
-                "weekendStudy": True,
-                "deadlineBuffer": 12,
-                "lunchStart": "12:00",
-                "lunchEnd": "13:00",
-                "dinnerStart": "18:00",
-                "dinnerEnd": "19:00",
-                "autoMeals": True,
-            }
+            return {"name": None, **_DEFAULT_PREFERENCES}
         
         return prefs.to_dict()
     except Exception as e:
@@ -646,42 +703,22 @@ def save_preferences(
             UserPreferences.user_id == user_id
         ).first()
         
+        values = UserPreferences.columns_from_api(prefs_data)
+        
         if existing:
             # Update existing
-            for key, value in prefs_data.items():
-                # Convert camelCase to snake_case
-                snake_key = ''.join(['_'+c.lower() if c.isupper() else c for c in key]).lstrip('_')
-                if hasattr(existing, snake_key):
-                    setattr(existing, snake_key, value)
+            for column, value in values.items():
+                setattr(existing, column, value)
             
             existing.updated_at = datetime.utcnow()
             db.commit()
             db.refresh(existing)
             return existing.to_dict()
         else:
-            # Create new
+            # Create new; omitted fields take the column defaults
             new_prefs = UserPreferences(
                 user_id=user_id,  # ✅ USE REAL USER ID
-                name=prefs_data.get("name"),
-                timezone=prefs_data.get("timezone", "America/New_York"),
-                wake=prefs_data.get("wake", "08:00"),
-                sleep=prefs_data.get("sleep", "23:00"),
-                max_study_hours=prefs_data.get("maxStudyHours", 6.0),
-                session_length=prefs_data.get("sessionLength", 60),
-                break_duration=prefs_data.get("breakDuration", 15),
-                between_classes=prefs_data.get("betweenClasses", 30),
-                after_school=prefs_data.get("afterSchool", 120),
-                urgency_mode=prefs_data.get("urgencyMode", "balanced"),
-                study_time=prefs_data.get("studyTime", "afternoon"),
-                auto_split=prefs_data.get("autoSplit", True),
-                prioritize_hard=prefs_data.get("prioritizeHard", True),
-                weekend_study=prefs_data.get("weekendStudy", True),
-                deadline_buffer=prefs_data.get("deadlineBuffer", 12),
-                lunch_start=prefs_data.get("lunchStart", "12:00"),
-                lunch_end=prefs_data.get("lunchEnd", "13:00"),
-                dinner_start=prefs_data.get("dinnerStart", "18:00"),
-                dinner_end=prefs_data.get("dinnerEnd", "19:00"),
-                auto_meals=prefs_data.get("autoMeals", True),
+                **values
             )
             
             db.add(new_prefs)
@@ -697,6 +734,31 @@ def save_preferences(
 # ============================================
 # SCHEDULE - ADD AUTHENTICATION
 # ============================================
+class ScheduledEventOut(BaseModel):
+    """Response shape for a saved ScheduledEvent row"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: str
+    task_id: Optional[str] = None
+    title: str
+    date: str
+    start: str
+    end: str
+    duration: int
+    status: Optional[str] = None
+    difficulty: Optional[str] = None
+    color: Optional[str] = None
+    completed: Optional[bool] = None
+    completed_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class ScheduleOut(BaseModel):
+    """Response shape for GET /api/schedule"""
+    schedule: List[ScheduledEventOut]
+
+
 @app.post("/api/schedule/from-database")
 def generate_schedule_from_db(
     force: bool = False,
@@ -706,11 +768,11 @@ def generate_schedule_from_db(
     """Generate schedule - ONLY when explicitly requested"""
     user_id = current_user["user_id"]  # ✅ USE REAL USER ID
     
-    existing_events = db.query(ScheduledEvent).filter(
+    has_existing = db.query(ScheduledEvent.id).filter(
         ScheduledEvent.user_id == user_id  # ✅ FILTER BY USER
-    ).count()
+    ).first() is not None
     
-    if existing_events > 0 and not force:
+    if has_existing and not force:
         events = db.query(ScheduledEvent).filter(
             ScheduledEvent.user_id == user_id  # ✅ FILTER BY USER
         ).all()
@@ -722,43 +784,21 @@ def generate_schedule_from_db(
 
     try:
         # ✅ FILTER ALL QUERIES BY USER
-        courses = db.query(Course).filter(Course.user_id == user_id).all()
-        tasks = db.query(Task).filter(
+        courses = db.scalars(owned_rows_stmt(Course, user_id)).all()
+        # Scheduling never reads notes; raise instead of lazy-loading them
+        tasks = db.query(Task).options(defer(Task.notes, raiseload=True)).filter(
             Task.user_id == user_id,
             Task.completed == False
         ).all()
-        breaks = db.query(Break).filter(Break.user_id == user_id).all()
-        jobs = db.query(Job).filter(Job.user_id == user_id).all()
-        commutes = db.query(Commute).filter(Commute.user_id == user_id).all()
+        breaks = db.scalars(owned_rows_stmt(Break, user_id)).all()
+        jobs = db.scalars(owned_rows_stmt(Job, user_id)).all()
+        commutes = db.scalars(owned_rows_stmt(Commute, user_id)).all()
         
         prefs = db.query(UserPreferences).filter(
             UserPreferences.user_id == user_id
         ).first()
         
-        if prefs:
-            preferences = prefs.to_dict()
-        else:
-            preferences = {
-                "wake": "08:00",
-                "sleep": "23:00",
-                "timezone": "America/New_York",
-                "maxStudyHours": 6,
-                "sessionLength": 60,
-                "breakDuration": 15,
-                "betweenClasses": 30,
-                "afterSchool": 120,
-                "urgencyMode": "balanced",
-                "studyTime": "afternoon",
-                "autoSplit": True,
-                "prioritizeHard": True,
-                "weekendStudy": True,
-                "deadlineBuffer": 12,
-                "lunchStart": "12:00",
-                "lunchEnd": "13:00",
-                "dinnerStart": "18:00",
-                "dinnerEnd": "19:00",
-                "autoMeals": True,
-            }
+        preferences = prefs.to_dict() if prefs else dict(_DEFAULT_PREFERENCES)
         
         logger.info(f"Generating NEW schedule from scratch for user {user_id}")
         
@@ -772,16 +812,9 @@ def generate_schedule_from_db(
                 }
             }
         
-        payload_dict = {
-            "courses": [c.to_dict() for c in courses],
-            "tasks": [t.to_dict() for t in tasks],
-            "breaks": [b.to_dict() for b in breaks],
-            "jobs": [j.to_dict() for j in jobs],
-            "commutes": [c.to_dict() for c in commutes],
-            "preferences": preferences
-        }
-        
-        result = scheduler.generate_schedule(payload_dict)
+        result = scheduler.generate_schedule_from_orm(
+            courses, tasks, breaks, jobs, commutes, preferences
+        )
         logger.info(f"Schedule generated: {len(result.get('events', []))} events")
         
         try:
@@ -790,30 +823,23 @@ def generate_schedule_from_db(
                 ScheduledEvent.user_id == user_id
             ).delete()
             
-            saved_count = 0
-            for event in result.get('events', []):
-                if event.get('status') not in ['scheduled', 'incomplete', 'exam']:
-                    continue
-                
-                date_str = event.get('date', '')
-                start_str = event.get('start', '')
-                end_str = event.get('end', '')
-                
-                scheduled_event = ScheduledEvent(
-                    user_id=user_id,  # ✅ ADD THIS
-                    task_id=event.get('task_id', 'generated'),
-                    title=event.get('title', 'Study Session'),
-                    date=date_str,
-                    start=start_str,
-                    end=end_str,
-                    duration=event.get('duration', 0),
-                    status=event.get('status', 'scheduled'),
-                    difficulty=event.get('difficulty'),
-                    color=event.get('color', '#4CAF50')
-                )
-                
-                db.add(scheduled_event)
-                saved_count += 1
+            rows = [
+                {
+                    "user_id": user_id,
+                    "task_id": event.get('task_id'),
+                    "title": event.get('title', 'Study Session'),
+                    "date": event.get('date', ''),
+                    "start": event.get('start', ''),
+                    "end": event.get('end', ''),
+                    "duration": event.get('duration', 0),
+                    "status": event.get('status', 'scheduled'),
+                    "difficulty": event.get('difficulty'),
+                    "color": event.get('color', '#4CAF50'),
+                }
+                for event in result.get('events', [])
+                if event.get('status') in _PERSISTED_EVENT_STATUSES
+            ]
+            saved_count = ScheduledEvent.bulk_create(db, rows, tasks)
             
             db.commit()
             logger.info(f"✓ Saved {saved_count} events to database")
@@ -829,7 +855,7 @@ def generate_schedule_from_db(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/schedule")
+@app.get("/api/schedule", response_model=ScheduleOut)
 def get_saved_schedule(
     current_user: dict = Depends(get_current_user),  # ✅ ADD THIS
     db: Session = Depends(get_db)
@@ -837,13 +863,12 @@ def get_saved_schedule(
     """Retrieve saved schedule"""
     try:
         user_id = current_user["user_id"]  # ✅ ADD THIS
-        events = db.query(ScheduledEvent).filter(
-            ScheduledEvent.user_id == user_id  # ✅ FILTER BY USER
-        ).all()
+        events = ScheduledEvent.fetch_rows(
+            db, ScheduledEvent.user_id == user_id  # ✅ FILTER BY USER
+        )
         
-        return {
-            "schedule": [event.to_dict() for event in events]
-        }
+        # Returned as data so response_model=ScheduleOut validates it
+        return {"schedule": events}
         
     except Exception as e:
         logger.error(f"Error retrieving schedule: {e}")
@@ -860,35 +885,31 @@ def update_scheduled_event(
     """Update a single scheduled event"""
     try:
         user_id = current_user["user_id"]  # ✅ ADD THIS
-        event = db.query(ScheduledEvent).filter(
-            ScheduledEvent.id == event_id,
-            ScheduledEvent.user_id == user_id  # ✅ ENSURE USER OWNS THIS
+        values = {k: event_data[k] for k in _EDITABLE_EVENT_FIELDS if k in event_data}
+        
+        # Single UPDATE ... RETURNING instead of SELECT + modify + refresh
+        event = db.scalars(
+            update(ScheduledEvent)
+            .where(
+                ScheduledEvent.id == event_id,
+                ScheduledEvent.user_id == user_id  # ✅ ENSURE USER OWNS THIS
+            )
+            .values(**values)
+            .returning(ScheduledEvent),
+            execution_options={"synchronize_session": False}
         ).first()
         
         if not event:
             raise HTTPException(status_code=404, detail="Event not found")
         
-        if "date" in event_data:
-            event.date = event_data["date"]
-        if "start" in event_data:
-            event.start = event_data["start"]
-        if "end" in event_data:
-            event.end = event_data["end"]
-        if "duration" in event_data:
-            event.duration = event_data["duration"]
-        if "title" in event_data:
-            event.title = event_data["title"]
-        
-        event.updated_at = datetime.utcnow()
-        
+        event_dict = event.to_dict()
         db.commit()
-        db.refresh(event)
         
-        logger.info(f"✓ Updated event {event_id}: {event.title} -> {event.date} {event.start}")
+        logger.info(f"✓ Updated event {event_id}: {event_dict['title']} -> {event_dict['date']} {event_dict['start']}")
         
         return {
             "message": "Event updated successfully",
-            "event": event.to_dict()
+            "event": event_dict
         }
         
     except HTTPException:
@@ -942,13 +963,12 @@ def clear_all_data(
     try:
         user_id = current_user["user_id"]  # ✅ ADD THIS
         
-        # ✅ DELETE ONLY USER'S DATA
-        db.query(ScheduledEvent).filter(ScheduledEvent.user_id == user_id).delete()
-        db.query(Task).filter(Task.user_id == user_id).delete()
-        db.query(Course).filter(Course.user_id == user_id).delete()
-        db.query(Break).filter(Break.user_id == user_id).delete()
-        db.query(Job).filter(Job.user_id == user_id).delete()
-        db.query(Commute).filter(Commute.user_id == user_id).delete()
+        # ✅ DELETE ONLY USER'S DATA (bulk DELETEs, no session sync)
+        for model in _CLEARABLE_MODELS:
+            db.execute(
+                delete(model).where(model.user_id == user_id),
+                execution_options={"synchronize_session": False}
+            )
         
         db.commit()
         
@@ -972,8 +992,8 @@ def generate_schedule_from_db(
     db: Session = Depends(get_db)
 ):
     """Generate schedule - ONLY when explicitly requested"""
-    existing_events = db.query(ScheduledEvent).count()
-    if existing_events > 0 and not force:
+    has_existing = db.query(ScheduledEvent.id).first() is not None
+    if has_existing and not force:
         events = db.query(ScheduledEvent).all()
         return {
             "events": [e.to_dict() for e in events],
@@ -983,7 +1003,9 @@ def generate_schedule_from_db(
 
     try:
         courses = db.query(Course).all()
-        tasks = db.query(Task).filter(Task.completed == False).all()
+        tasks = db.query(Task).options(defer(Task.notes, raiseload=True)).filter(
+            Task.completed == False
+        ).all()
         breaks = db.query(Break).all()
         jobs = db.query(Job).all()
         commutes = db.query(Commute).all()
@@ -992,30 +1014,7 @@ def generate_schedule_from_db(
             UserPreferences.user_id == user_id
         ).first()
         
-        if prefs:
-            preferences = prefs.to_dict()
-        else:
-            preferences = {
-                "wake": "08:00",
-                "sleep": "23:00",
-                "timezone": "America/New_York",
-                "maxStudyHours": 6,
-                "sessionLength": 60,
-                "breakDuration": 15,
-                "betweenClasses": 30,
-                "afterSchool": 120,
-                "urgencyMode": "balanced",
-                "studyTime": "afternoon",
-                "autoSplit": True,
-                "prioritizeHard": True,
-                "weekendStudy": True,
-                "deadlineBuffer": 12,
-                "lunchStart": "12:00",
-                "lunchEnd": "13:00",
-                "dinnerStart": "18:00",
-                "dinnerEnd": "19:00",
-                "autoMeals": True,
-            }
+        preferences = prefs.to_dict() if prefs else dict(_DEFAULT_PREFERENCES)
         
         logger.info(f"Generating NEW schedule from scratch")
         
@@ -1029,44 +1028,30 @@ def generate_schedule_from_db(
                 }
             }
         
-        payload_dict = {
-            "courses": [c.to_dict() for c in courses],
-            "tasks": [t.to_dict() for t in tasks],
-            "breaks": [b.to_dict() for b in breaks],
-            "jobs": [j.to_dict() for j in jobs],
-            "commutes": [c.to_dict() for c in commutes],
-            "preferences": preferences
-        }
-        
-        result = scheduler.generate_schedule(payload_dict)
+        result = scheduler.generate_schedule_from_orm(
+            courses, tasks, breaks, jobs, commutes, preferences
+        )
         logger.info(f"Schedule generated: {len(result.get('events', []))} events")
         
         try:
             db.query(ScheduledEvent).delete()
             
-            saved_count = 0
-            for event in result.get('events', []):
-                if event.get('status') not in ['scheduled', 'incomplete', 'exam']:
-                    continue
-                
-                date_str = event.get('date', '')
-                start_str = event.get('start', '')
-                end_str = event.get('end', '')
-                
-                scheduled_event = ScheduledEvent(
-                    task_id=event.get('task_id', 'generated'),
-                    title=event.get('title', 'Study Session'),
-                    date=date_str,
-                    start=start_str,
-                    end=end_str,
-                    duration=event.get('duration', 0),
-                    status=event.get('status', 'scheduled'),
-                    difficulty=event.get('difficulty'),
-                    color=event.get('color', '#4CAF50')
-                )
-                
-                db.add(scheduled_event)
-                saved_count += 1
+            rows = [
+                {
+                    "task_id": event.get('task_id'),
+                    "title": event.get('title', 'Study Session'),
+                    "date": event.get('date', ''),
+                    "start": event.get('start', ''),
+                    "end": event.get('end', ''),
+                    "duration": event.get('duration', 0),
+                    "status": event.get('status', 'scheduled'),
+                    "difficulty": event.get('difficulty'),
+                    "color": event.get('color', '#4CAF50'),
+                }
+                for event in result.get('events', [])
+                if event.get('status') in _PERSISTED_EVENT_STATUSES
+            ]
+            saved_count = ScheduledEvent.bulk_create(db, rows, tasks)
             
             db.commit()
             logger.info(f"✓ Saved {saved_count} events to database")
@@ -1086,32 +1071,27 @@ def generate_schedule_from_db(
 def update_scheduled_event(event_id: str, event_data: dict, db: Session = Depends(get_db)):
     """Update a single scheduled event"""
     try:
-        event = db.query(ScheduledEvent).filter(ScheduledEvent.id == event_id).first()
+        values = {k: event_data[k] for k in _EDITABLE_EVENT_FIELDS if k in event_data}
+        
+        event = db.scalars(
+            update(ScheduledEvent)
+            .where(ScheduledEvent.id == event_id)
+            .values(**values)
+            .returning(ScheduledEvent),
+            execution_options={"synchronize_session": False}
+        ).first()
         
         if not event:
             raise HTTPException(status_code=404, detail="Event not found")
         
-        if "date" in event_data:
-            event.date = event_data["date"]
-        if "start" in event_data:
-            event.start = event_data["start"]
-        if "end" in event_data:
-            event.end = event_data["end"]
-        if "duration" in event_data:
-            event.duration = event_data["duration"]
-        if "title" in event_data:
-            event.title = event_data["title"]
-        
-        event.updated_at = datetime.utcnow()
-        
+        event_dict = event.to_dict()
         db.commit()
-        db.refresh(event)
         
-        logger.info(f"✓ Updated event {event_id}: {event.title} -> {event.date} {event.start}")
+        logger.info(f"✓ Updated event {event_id}: {event_dict['title']} -> {event_dict['date']} {event_dict['start']}")
         
         return {
             "message": "Event updated successfully",
-            "event": event.to_dict()
+            "event": event_dict
         }
         
     except HTTPException:
@@ -1175,20 +1155,27 @@ def get_saved_schedule(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@lru_cache(maxsize=1)
+def _pdf_date_stamp(day_ordinal: int) -> str:
+    """YYYYMMDD stamp for PDF filenames, formatted once per day"""
+    return date.fromordinal(day_ordinal).strftime('%Y%m%d')
+
+
 @app.post("/api/generate-pdf")
 async def generate_pdf(schedule_data: dict):
     """Generate PDF from schedule data"""
+    if _PDF_GENERATOR is None:
+        raise HTTPException(status_code=500, detail="PDF generation unavailable: reportlab is not installed")
+    
     try:
-        from pdfgeneration import PDFScheduleGenerator
-        
-        generator = PDFScheduleGenerator()
-        pdf_buffer = generator.generate(schedule_data)
+        # doc.build is CPU-bound; run it off the event loop
+        pdf_stream = await run_in_threadpool(_PDF_GENERATOR.generate_stream, schedule_data)
         
         return StreamingResponse(
-            pdf_buffer,
+            pdf_stream,
             media_type="application/pdf",
             headers={
-                "Content-Disposition": f"attachment; filename=StudyTime_Schedule_{datetime.now().strftime('%Y%m%d')}.pdf"
+                "Content-Disposition": f"attachment; filename=StudyTime_Schedule_{_pdf_date_stamp(date.today().toordinal())}.pdf"
             }
         )
     except Exception as e:
@@ -1196,32 +1183,6 @@ async def generate_pdf(schedule_data: dict):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.delete("/api/clear-all")
-def clear_all_data(confirm: str = None, db: Session = Depends(get_db)):
-    """Clear all data from database"""
-    if confirm != "yes":
-        raise HTTPException(status_code=400, detail="Must confirm with ?confirm=yes")
-    
-    try:
-        db.query(ScheduledEvent).delete()
-        db.query(Task).delete()
-        db.query(Course).delete()
-        db.query(Break).delete()
-        db.query(Job).delete()
-        db.query(Commute).delete()
-        
-        db.commit()
-        
-        logger.info("All data cleared from database")
-        
-        return {"message": "All data cleared successfully"}
-        
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Error clearing data: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
 # Static Files
 if frontend_dir.exists():
     try:
@@ -1,17 +1,127 @@
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, ForeignKey, String, Integer, Boolean, DateTime, JSON, Text, Float
-from datetime import datetime
+from sqlalchemy import Column, ForeignKey, String, Integer, Boolean, DateTime, JSON, Text, Float, Index
+from sqlalchemy import inspect as sa_inspect, event, insert, select, update
+from sqlalchemy.orm import relationship, validates
+from datetime import datetime, time
+from dataclasses import make_dataclass
+from functools import lru_cache
 import uuid
 
 Base = declarative_base()
 
 def generate_uuid():
-    """Generate a unique UUID string"""
-    return str(uuid.uuid4())
+    """Generate a unique UUID string (32-char hex)"""
+    return uuid.uuid4().hex
+
+
+# ============================================
+# Column types
+# ============================================
+
+# Bounded string sizes: "HH:MM", "MM/DD/YYYY", "#RRGGBB[AA]"
+TimeOfDay = String(5)
+DateString = String(10)
+ColorHex = String(9)
+
+# Difficulty and status stay plain bounded strings so rows written before
+# new values were checked still load; Task validates difficulty on write
+DIFFICULTY_LEVELS = ("Easy", "Medium", "Hard")
+EVENT_STATUSES = ("scheduled", "incomplete", "exam", "completed", "cancelled", "overdue")
+Difficulty = String(6)
+EventStatus = String(10)
+
+
+# ============================================
+# Serialization helpers
+# ============================================
+
+TIMESTAMP_KEYS = ("created_at", "updated_at")
+
+
+def _install_serializers(cls, datetime_keys=TIMESTAMP_KEYS, rename=None):
+    """
+    Attach to_dict() and to_dto() to a model class with its output layout
+    precomputed.
+    
+    Column keys (minus cls._hidden_fields), output names and datetime keys
+    are resolved once here. The generated methods read straight from
+    __dict__ to skip the instrumented attribute descriptors, falling back to
+    getattr() when attributes are expired or deferred so they still load.
+    
+    to_dto() returns a slotted dataclass (cls.DTO) that orjson serializes
+    natively, datetimes included, without building an intermediate dict.
+    """
+    hidden = getattr(cls, "_hidden_fields", ())
+    keys = tuple(
+        attr.key for attr in sa_inspect(cls).column_attrs
+        if attr.key not in hidden
+    )
+    rename = rename or {}
+    out_keys = tuple(rename.get(key, key) for key in keys)
+    out_datetime_keys = tuple(rename.get(key, key) for key in datetime_keys)
+    # __slots__ by hand: make_dataclass(slots=True) needs Python 3.10
+    dto_cls = make_dataclass(
+        f"{cls.__name__}DTO", out_keys, namespace={"__slots__": out_keys}
+    )
+    
+    def row_values(self):
+        state = self.__dict__
+        try:
+            return [state[key] for key in keys]
+        except KeyError:
+            return [getattr(self, key) for key in keys]
+    
+    def to_dict(self):
+        data = dict(zip(out_keys, row_values(self)))
+        
+        for key in out_datetime_keys:
+            value = data[key]
+            data[key] = value.isoformat() if value else None
+        return data
+    
+    def to_dto(self):
+        return dto_cls(*row_values(self))
+    
+    to_dict.__qualname__ = f"{cls.__name__}.to_dict"
+    to_dto.__qualname__ = f"{cls.__name__}.to_dto"
+    cls.to_dict = to_dict
+    cls.to_dto = to_dto
+    cls.DTO = dto_cls
+    cls._serialized_keys = keys
+
+
+# ============================================
+# Typed accessors for string-stored times
+# ============================================
+
+@lru_cache(maxsize=4096)
+def parse_iso_datetime(value):
+    """Parse an ISO-8601 timestamp (e.g. Task.due), accepting a trailing 'Z'"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+@lru_cache(maxsize=2048)
+def parse_time_of_day(value):
+    """Parse an "HH:MM" column value into a datetime.time"""
+    return time.fromisoformat(value)
+
+
+class TimeRangeMixin:
+    """Parsed views of the "HH:MM" start/end columns"""
+    
+    @property
+    def start_time(self):
+        return parse_time_of_day(self.start)
+    
+    @property
+    def end_time(self):
+        return parse_time_of_day(self.end)
+
 
 class User(Base):
     """User authentication and account management"""
     __tablename__ = "users"
+    _hidden_fields = ("hashed_password",)
     
     id = Column(String, primary_key=True, default=generate_uuid)
     email = Column(String, unique=True, nullable=False, index=True)
@@ -23,175 +133,146 @@ class User(Base):
     
     created_at = Column(DateTime, default=datetime.utcnow)
     last_login = Column(DateTime, nullable=True)
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "email": self.email,
-            "username": self.username,
-            "full_name": self.full_name,
-            "is_active": self.is_active,
-            "is_admin": self.is_admin,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "last_login": self.last_login.isoformat() if self.last_login else None
-        }
-
-class Course(Base):
+
+class Course(TimeRangeMixin, Base):
     """Represents a recurring course/class"""
     __tablename__ = "courses"
+    _hidden_fields = ("user_id",)
     
     id = Column(String, primary_key=True, default=generate_uuid)
     user_id = Column(String, ForeignKey('users.id'), nullable=False, index=True)
     name = Column(String, nullable=False)
     days = Column(JSON, nullable=False)
-    start = Column(String, nullable=False)
-    end = Column(String, nullable=False)
-    color = Column(String, default="#1565c0")
+    start = Column(TimeOfDay, nullable=False)
+    end = Column(TimeOfDay, nullable=False)
+    color = Column(ColorHex, default="#1565c0")
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "days": self.days,
-            "start": self.start,
-            "end": self.end,
-            "color": self.color,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
-        }
+    tasks = relationship("Task", back_populates="course", lazy="raise", passive_deletes=True)
 
 
 class Task(Base):
     """Represents an assignment or task to be scheduled"""
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Pending-task lookups: filter by user and completed, ordered by due
+        Index("ix_tasks_user_completed_due", "user_id", "completed", "due"),
+    )
+    _hidden_fields = ("user_id",)
     
     id = Column(String, primary_key=True, default=generate_uuid)
     user_id = Column(String, ForeignKey('users.id'), nullable=False, index=True)
     name = Column(String, nullable=False)
     duration = Column(Integer, nullable=False)
     due = Column(String, nullable=False)
-    difficulty = Column(String, default="Medium")
+    difficulty = Column(Difficulty, default="Medium")
     is_exam = Column(Boolean, default=False)
-    color = Column(String, default="#4CAF50")
+    color = Column(ColorHex, default="#4CAF50")
     
     completed = Column(Boolean, default=False)
     completion_date = Column(DateTime, nullable=True)
     
-    course_id = Column(String, nullable=True)
+    course_id = Column(String, ForeignKey('courses.id', ondelete="SET NULL"), nullable=True, index=True)
     notes = Column(Text, nullable=True)
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "duration": self.duration,
-            "due": self.due,
-            "difficulty": self.difficulty,
-            "is_exam": self.is_exam,
-            "color": self.color,
-            "completed": self.completed,
-            "completion_date": self.completion_date.isoformat() if self.completion_date else None,
-            "course_id": self.course_id,
-            "notes": self.notes,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
-        }
-
-
-class Break(Base):
+    # Relationships never lazy-load; use selectinload() where needed
+    course = relationship("Course", back_populates="tasks", lazy="raise")
+    events = relationship(
+        "ScheduledEvent", back_populates="task", lazy="raise",
+        cascade="all, delete-orphan", passive_deletes=True,
+    )
+    
+    @property
+    def due_dt(self):
+        return parse_iso_datetime(self.due)
+    
+    @validates("difficulty")
+    def validate_difficulty(self, key, value):
+        if value is not None and value not in DIFFICULTY_LEVELS:
+            raise ValueError(f"difficulty must be one of {', '.join(DIFFICULTY_LEVELS)}")
+        return value
+
+
+class Break(TimeRangeMixin, Base):
     """Represents recurring breaks, lunch, or blocked time"""
     __tablename__ = "breaks"
+    _hidden_fields = ("user_id",)
     
     id = Column(String, primary_key=True, default=generate_uuid)
     user_id = Column(String, ForeignKey('users.id'), nullable=False, index=True)
     name = Column(String, nullable=False)
     day = Column(String, nullable=False)
-    start = Column(String, nullable=False)
-    end = Column(String, nullable=False)
-    color = Column(String, default="#FF9800")
+    start = Column(TimeOfDay, nullable=False)
+    end = Column(TimeOfDay, nullable=False)
+    color = Column(ColorHex, default="#FF9800")
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "day": self.day,
-            "start": self.start,
-            "end": self.end,
-            "color": self.color,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
-        }
-
-
-class Job(Base):
+
+
+class Job(TimeRangeMixin, Base):
     """Represents work/job schedule"""
     __tablename__ = "jobs"
+    _hidden_fields = ("user_id",)
     
     id = Column(String, primary_key=True, default=generate_uuid)
     user_id = Column(String, ForeignKey('users.id'), nullable=False, index=True)
     name = Column(String, nullable=False)
     days = Column(JSON, nullable=False)
-    start = Column(String, nullable=False)
-    end = Column(String, nullable=False)
-    color = Column(String, default="#9C27B0")
+    start = Column(TimeOfDay, nullable=False)
+    end = Column(TimeOfDay, nullable=False)
+    color = Column(ColorHex, default="#9C27B0")
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "days": self.days,
-            "start": self.start,
-            "end": self.end,
-            "color": self.color,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
-        }
-
-
-class Commute(Base):
+
+
+class Commute(TimeRangeMixin, Base):
     """Represents commute times"""
     __tablename__ = "commutes"
+    _hidden_fields = ("user_id",)
     
     id = Column(String, primary_key=True, default=generate_uuid)
     user_id = Column(String, ForeignKey('users.id'), nullable=False, index=True)
     name = Column(String, nullable=False)
     days = Column(JSON, nullable=False)
-    start = Column(String, nullable=False)
-    end = Column(String, nullable=False)
-    color = Column(String, default="#607D8B")
+    start = Column(TimeOfDay, nullable=False)
+    end = Column(TimeOfDay, nullable=False)
+    color = Column(ColorHex, default="#607D8B")
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "days": self.days,
-            "start": self.start,
-            "end": self.end,
-            "color": self.color,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
-        }
 
 
 class UserPreferences(Base):
     """Stores comprehensive user preferences for scheduling"""
     __tablename__ = "user_preferences"
     
+    # Column -> API field names (the frontend uses camelCase)
+    _API_NAMES = {
+        "max_study_hours": "maxStudyHours",
+        "session_length": "sessionLength",
+        "break_duration": "breakDuration",
+        "between_classes": "betweenClasses",
+        "after_school": "afterSchool",
+        "urgency_mode": "urgencyMode",
+        "study_time": "studyTime",
+        "auto_split": "autoSplit",
+        "prioritize_hard": "prioritizeHard",
+        "weekend_study": "weekendStudy",
+        "deadline_buffer": "deadlineBuffer",
+        "lunch_start": "lunchStart",
+        "lunch_end": "lunchEnd",
+        "dinner_start": "dinnerStart",
+        "dinner_end": "dinnerEnd",
+        "auto_meals": "autoMeals",
+    }
+    
     id = Column(String, primary_key=True, default=generate_uuid)
     user_id = Column(String, ForeignKey('users.id'), nullable=False, index=True)
     # Personal info
@@ -234,53 +315,38 @@ class UserPreferences(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "name": self.name,
-            "timezone": self.timezone,
-            "wake": self.wake,
-            "sleep": self.sleep,
-            "maxStudyHours": self.max_study_hours,
-            "sessionLength": self.session_length,
-            "breakDuration": self.break_duration,
-            "betweenClasses": self.between_classes,
-            "afterSchool": self.after_school,
-            "urgencyMode": self.urgency_mode,
-            "studyTime": self.study_time,
-            "autoSplit": self.auto_split,
-            "prioritizeHard": self.prioritize_hard,
-            "weekendStudy": self.weekend_study,
-            "deadlineBuffer": self.deadline_buffer,
-            "lunchStart": self.lunch_start,
-            "lunchEnd": self.lunch_end,
-            "dinnerStart": self.dinner_start,
-            "dinnerEnd": self.dinner_end,
-            "autoMeals": self.auto_meals,
-            "notifications_enabled": self.notifications_enabled,
-            "reminder_minutes_before": self.reminder_minutes_before,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
-        }
-
-
-class ScheduledEvent(Base):
+    # API field name (camelCase or column name) -> settable column, see below
+    _COLUMNS_BY_API_NAME = {}
+    
+    @classmethod
+    def columns_from_api(cls, data):
+        """Map an API payload onto column values, ignoring unknown fields"""
+        columns = cls._COLUMNS_BY_API_NAME
+        return {columns[key]: value for key, value in data.items() if key in columns}
+
+
+class ScheduledEvent(TimeRangeMixin, Base):
     """Stores generated schedule events (study sessions)"""
     __tablename__ = "scheduled_events"
+    __table_args__ = (
+        # Calendar reads: a user's events in date/start order
+        Index("ix_events_user_date_start", "user_id", "date", "start"),
+        Index("ix_events_task_id", "task_id"),
+    )
+    _hidden_fields = ("user_id",)
     
     id = Column(String, primary_key=True, default=generate_uuid)
-    task_id = Column(String, nullable=False)
+    task_id = Column(String, ForeignKey('tasks.id', ondelete="CASCADE"), nullable=True)
     user_id = Column(String, ForeignKey('users.id'), nullable=False, index=True)
     title = Column(String, nullable=False)
-    date = Column(String, nullable=False)
-    start = Column(String, nullable=False)
-    end = Column(String, nullable=False)
+    date = Column(DateString, nullable=False)
+    start = Column(TimeOfDay, nullable=False)
+    end = Column(TimeOfDay, nullable=False)
     duration = Column(Integer, nullable=False)
     
-    status = Column(String, default="scheduled")
-    difficulty = Column(String, nullable=True)
-    color = Column(String, default="#4CAF50")
+    status = Column(EventStatus, default="scheduled")
+    difficulty = Column(Difficulty, nullable=True)
+    color = Column(ColorHex, default="#4CAF50")
     
     completed = Column(Boolean, default=False)
     completed_at = Column(DateTime, nullable=True)
@@ -288,20 +354,77 @@ class ScheduledEvent(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "task_id": self.task_id,
-            "title": self.title,
-            "date": self.date,
-            "start": self.start,
-            "end": self.end,
-            "duration": self.duration,
-            "status": self.status,
-            "difficulty": self.difficulty,
-            "color": self.color,
-            "completed": self.completed,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+    task = relationship("Task", back_populates="events", lazy="raise")
+    
+    @classmethod
+    def fetch_rows(cls, session, *criteria):
+        """
+        Read events as lightweight Core rows, skipping ORM instances and the
+        identity map. Rows expose the same columns as to_dict() as attributes.
+        """
+        table = cls.__table__
+        columns = [table.c[key] for key in cls._serialized_keys]
+        return session.execute(select(*columns).where(*criteria)).all()
+    
+    @classmethod
+    def bulk_create(cls, session, rows, tasks=None):
+        """
+        Insert many events from plain dicts in a single executemany.
+        
+        Skips ORM object construction and unit-of-work bookkeeping; column
+        defaults (id, timestamps, completed) are still applied. When the
+        parent `tasks` are given, rows without a difficulty get their task's,
+        so reads never need to join back to Task. The caller commits.
+        """
+        if tasks is not None:
+            difficulty_by_task = {task.id: task.difficulty for task in tasks}
+            for row in rows:
+                if row.get("difficulty") is None:
+                    row["difficulty"] = difficulty_by_task.get(row.get("task_id"))
+        if rows:
+            session.execute(insert(cls), rows)
+        return len(rows)
+
+
+# ============================================
+# Serializers
+# ============================================
+
+_install_serializers(User, ("created_at", "last_login"))
+_install_serializers(Course)
+_install_serializers(Task, ("completion_date",) + TIMESTAMP_KEYS)
+_install_serializers(Break)
+_install_serializers(Job)
+_install_serializers(Commute)
+_install_serializers(UserPreferences, rename=UserPreferences._API_NAMES)
+_install_serializers(ScheduledEvent, ("completed_at",) + TIMESTAMP_KEYS)
+
+
+def _camel_case(name):
+    head, *rest = name.split("_")
+    return head + "".join(part.title() for part in rest)
+
+
+# Keys, ownership and timestamps are never taken from a preferences payload
+_PROTECTED_PREFERENCE_COLUMNS = ("id", "user_id", "created_at", "updated_at")
+
+for _attr in sa_inspect(UserPreferences).column_attrs:
+    if _attr.key not in _PROTECTED_PREFERENCE_COLUMNS:
+        UserPreferences._COLUMNS_BY_API_NAME[_attr.key] = _attr.key
+        UserPreferences._COLUMNS_BY_API_NAME[_camel_case(_attr.key)] = _attr.key
+del _attr
+
+
+# ============================================
+# Denormalized event fields
+# ============================================
+
+@event.listens_for(Task, "after_update")
+def _sync_event_difficulty(mapper, connection, target):
+    """Push a task's new difficulty onto its saved events in one UPDATE"""
+    if sa_inspect(target).attrs.difficulty.history.has_changes():
+        connection.execute(
+            update(ScheduledEvent.__table__)
+            .where(ScheduledEvent.__table__.c.task_id == target.id)
+            .values(difficulty=target.difficulty)
+        )
@@ -11,57 +11,225 @@ from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from io import BytesIO
-from typing import List, Dict, Tuple
-from collections import defaultdict
+from tempfile import SpooledTemporaryFile
+from typing import List, Dict, Tuple, Iterator, BinaryIO, Optional
+from bisect import bisect_left
+from collections import defaultdict, namedtuple
+from functools import lru_cache
+from heapq import nsmallest
+from itertools import groupby
+from operator import attrgetter
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# PDFs larger than this spill from memory to a temp file while streaming
+SPOOL_MAX_SIZE = 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# zlib page compression costs ~2% of build time and shrinks output ~5x; set
+# to 0 only when a proxy already compresses the response
+PAGE_COMPRESSION = 1
+
+# Conflicts listed individually in the warnings table; the rest are counted
+OVERLAP_DISPLAY_LIMIT = 10
+
+# Normalized event used by the day tables and overlap checks
+_Event = namedtuple('_Event', 'title start_dt end_dt type')
+_BY_START = attrgetter('start_dt')
+
+
+def _title_of(item: Dict):
+    return item.get('title', 'Untitled')
+
+
+def _group_by_title(items: List[Dict]):
+    """(title, instances) pairs in title order, input order kept within a title"""
+    return groupby(sorted(items, key=_title_of), key=_title_of)
+
+# Long days are emitted as several tables of at most this many rows, so
+# page splits only ever re-measure a short table
+DAY_TABLE_CHUNK_ROWS = 40
+
+# Common shape of the timestamps we receive: YYYY-MM-DDTHH:MM[:SS[.ffffff]][Z|+HH:MM]
+_ISO_RE = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{6}))?)?'
+    r'(?:Z|[+-](?:[01]\d|2[0-3]):[0-5]\d)?',
+    re.ASCII,
+)
+
+
+
+# English names for the strftime fields we render ('%a', '%b')
+_WEEKDAY_ABBR = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+_MONTH_ABBR = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
+def _format_clock(dt: datetime) -> str:
+    """Same as dt.strftime('%I:%M %p'), without the libc strftime call"""
+    hour = dt.hour
+    return f"{(hour - 1) % 12 + 1:02d}:{dt.minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_string(value: str) -> Optional[datetime]:
+    """
+    Parse an ISO timestamp into a naive datetime, or None if it isn't one.
+    
+    Cached because the same strings repeat across recurring events and each
+    event is parsed by several passes.
+    """
+    # Fast path: build the datetime straight from the regex groups. Any
+    # offset is dropped, the same as the tzinfo=None below
+    match = _ISO_RE.fullmatch(value)
+    if match:
+        year, month, day, hour, minute, second, micro = match.groups()
+        try:
+            return datetime(int(year), int(month), int(day), int(hour), int(minute),
+                            int(second or 0), int(micro or 0))
+        except ValueError:
+            return None
+    
+    try:
+        # Try ISO format
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        # Convert to local time (remove timezone info for display)
+        return dt.replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _summary_table_style(color: str) -> TableStyle:
+    """Summary table style for a header color, built once per color"""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(color)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
+        ('PADDING', (0, 0), (-1, -1), 6),
+    ])
+
 
 class PDFScheduleGenerator:
     """Generate professional PDF schedules with improved readability"""
     
-    def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#667eea'),
-            spaceAfter=30,
-            alignment=1  # Center
-        )
-        self.heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=self.styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#333333'),
-            spaceAfter=12,
-            spaceBefore=12
-        )
-        self.day_heading_style = ParagraphStyle(
-            'DayHeading',
-            parent=self.styles['Heading3'],
-            fontSize=14,
-            textColor=colors.HexColor('#1565c0'),
-            spaceAfter=8,
-            spaceBefore=16,
-            leftIndent=0
-        )
+    # Row background and display label per event type
+    _TYPE_COLORS = {
+        'tasks': colors.HexColor('#C8E6C9'),
+        'courses': colors.HexColor('#BBDEFB'),
+        'breaks': colors.HexColor('#FFE0B2'),
+        'jobs': colors.HexColor('#E1BEE7')
+    }
+    _TYPE_LABELS = {
+        'tasks': 'Study',
+        'courses': 'Class',
+        'breaks': 'Break',
+        'jobs': 'Work'
+    }
+    
+    # Table styles are immutable once built, so every table shares them
+    _OVERLAP_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#E53935')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.HexColor('#ffebee'), colors.HexColor('#ffcdd2')]),
+        ('PADDING', (0, 0), (-1, -1), 6),
+    ])
+    
+    _DAY_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#424242')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('PADDING', (0, 0), (-1, -1), 6),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ])
+    
+    # Continuation chunks of a long day: same grid and body font, no header row
+    _DAY_BODY_STYLE = TableStyle([
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('PADDING', (0, 0), (-1, -1), 6),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ])
     
-    def generate(self, schedule_data: Dict) -> BytesIO:
+    _LEGEND_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#424242')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+        ('BACKGROUND', (1, 1), (1, 1), colors.HexColor('#C8E6C9')),
+        ('BACKGROUND', (1, 2), (1, 2), colors.HexColor('#BBDEFB')),
+        ('BACKGROUND', (1, 3), (1, 3), colors.HexColor('#FFE0B2')),
+        ('BACKGROUND', (1, 4), (1, 4), colors.HexColor('#E1BEE7')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('PADDING', (0, 0), (-1, -1), 8),
+    ])
+    
+    # Paragraph styles are read-only during a build, so instances share them
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#667eea'),
+        spaceAfter=30,
+        alignment=1  # Center
+    )
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#333333'),
+        spaceAfter=12,
+        spaceBefore=12
+    )
+    day_heading_style = ParagraphStyle(
+        'DayHeading',
+        parent=styles['Heading3'],
+        fontSize=14,
+        textColor=colors.HexColor('#1565c0'),
+        spaceAfter=8,
+        spaceBefore=16,
+        leftIndent=0
+    )
+    
+    def generate(self, schedule_data: Dict, buffer: Optional[BinaryIO] = None) -> BinaryIO:
         """
         Generate a PDF schedule from calendar data
         
         Args:
             schedule_data: Dictionary containing tasks, courses, breaks, jobs
+            buffer: Optional binary file object to write into (defaults to BytesIO)
             
         Returns:
-            BytesIO object containing the PDF
+            The buffer containing the PDF, rewound to the start
         """
-        buffer = BytesIO()
+        if buffer is None:
+            buffer = BytesIO()
         
         # Create PDF document
         doc = SimpleDocTemplate(
@@ -71,6 +239,7 @@ class PDFScheduleGenerator:
             leftMargin=0.75*inch,
             topMargin=0.75*inch,
             bottomMargin=0.75*inch,
+            pageCompression=PAGE_COMPRESSION,
         )
         
         # Build the PDF content
@@ -90,36 +259,38 @@ class PDFScheduleGenerator:
         story.append(self._create_legend())
         story.append(Spacer(1, 0.4*inch))
         
-        # Organize all events by day
-        daily_schedule = self._organize_by_day(schedule_data)
-        
-        # Check for overlaps
-        overlaps = self._detect_overlaps(schedule_data)
+        # Organize all events by day and check for overlaps in one pass
+        daily_schedule, overlaps, extra_overlaps = self._prepare(schedule_data)
         if overlaps:
             story.append(Paragraph("⚠️ Schedule Warnings", self.heading_style))
-            story.append(self._create_overlap_warnings(overlaps))
+            story.append(self._create_overlap_warnings(overlaps, extra_overlaps))
             story.append(Spacer(1, 0.3*inch))
         
         # Create day-by-day schedule
         if daily_schedule:
             story.append(Paragraph("Weekly Schedule", self.heading_style))
-            for date_str in sorted(daily_schedule.keys()):
-                story.extend(self._create_day_section(date_str, daily_schedule[date_str]))
+            for day in sorted(daily_schedule.keys()):
+                story.extend(self._create_day_section(day, daily_schedule[day]))
 
         
-        # Summary sections (optional - can be removed if too verbose)
-        story.append(PageBreak())
-        story.append(Paragraph("Schedule Summary by Type", self.heading_style))
-        story.append(Spacer(1, 0.2*inch))
-        
-        if schedule_data.get('courses'):
-            story.append(Paragraph("Courses Overview", self.day_heading_style))
-            story.append(self._create_courses_summary(schedule_data['courses']))
+        # Summary sections (optional - can be removed if too verbose).
+        # Skipped entirely when there is nothing to summarize, rather than
+        # ending the document on a page with only a heading
+        courses = schedule_data.get('courses')
+        jobs = schedule_data.get('jobs')
+        if courses or jobs:
+            story.append(PageBreak())
+            story.append(Paragraph("Schedule Summary by Type", self.heading_style))
             story.append(Spacer(1, 0.2*inch))
-        
-        if schedule_data.get('jobs'):
-            story.append(Paragraph("Work Schedule Overview", self.day_heading_style))
-            story.append(self._create_jobs_summary(schedule_data['jobs']))
+            
+            if courses:
+                story.append(Paragraph("Courses Overview", self.day_heading_style))
+                story.append(self._create_courses_summary(courses))
+                story.append(Spacer(1, 0.2*inch))
+            
+            if jobs:
+                story.append(Paragraph("Work Schedule Overview", self.day_heading_style))
+                story.append(self._create_jobs_summary(jobs))
         
         # Build PDF
         doc.build(story)
@@ -127,9 +298,42 @@ class PDFScheduleGenerator:
         
         return buffer
     
-    def _organize_by_day(self, schedule_data: Dict) -> Dict[str, List[Dict]]:
-        """Organize all events by day and sort chronologically"""
+    def generate_stream(self, schedule_data: Dict, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Generate a PDF and return an iterator over its bytes in fixed-size chunks
+        
+        The PDF is built before this returns, so errors surface to the caller.
+        Output is spooled to a temp file once it exceeds SPOOL_MAX_SIZE, which
+        keeps memory bounded for long schedules.
+        """
+        spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        try:
+            self.generate(schedule_data, spool)
+        except Exception:
+            spool.close()
+            raise
+        return self._iter_chunks(spool, chunk_size)
+    
+    @staticmethod
+    def _iter_chunks(spool, chunk_size: int) -> Iterator[bytes]:
+        """Yield chunks from a spooled PDF and close it when exhausted"""
+        with spool:
+            while True:
+                chunk = spool.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+    
+    def _prepare(self, schedule_data: Dict, limit: int = OVERLAP_DISPLAY_LIMIT) -> Tuple[Dict[date, List[_Event]], List[Dict], int]:
+        """
+        Normalize all events in a single pass
+        
+        Each event's start/end are parsed once. Returns the events grouped by
+        day (sorted chronologically), the first `limit` overlapping pairs and
+        the number of further overlaps.
+        """
         daily_events = defaultdict(list)
+        all_events = []
         
         # Process all event types
         for event_type, events in schedule_data.items():
@@ -137,190 +341,142 @@ class PDFScheduleGenerator:
                 continue
                 
             for event in events:
-                event_copy = event.copy()
-                event_copy['type'] = event_type
-                
                 # Parse datetime
                 start_dt = self._parse_datetime(event.get('start'))
-                if start_dt:
-                    date_key = start_dt.strftime('%Y-%m-%d')
-                    event_copy['start_dt'] = start_dt
-                    
-                    end_dt = self._parse_datetime(event.get('end'))
-                    if end_dt:
-                        event_copy['end_dt'] = end_dt
-                    
-                    daily_events[date_key].append(event_copy)
+                if not start_dt:
+                    continue
+                
+                end_dt = self._parse_datetime(event.get('end'))
+                entry = _Event(event.get('title', 'Untitled'), start_dt, end_dt, event_type)
+                daily_events[start_dt.date()].append(entry)
+                if end_dt:
+                    all_events.append(entry)
         
         # Sort events within each day
         for date_key in daily_events:
-            daily_events[date_key].sort(key=lambda x: x.get('start_dt', datetime.max))
-        
-        return daily_events
-    
-    def _detect_overlaps(self, schedule_data: Dict) -> List[Dict]:
-        """Detect overlapping events"""
-        overlaps = []
-        all_events = []
-        
-        # Collect all events with timestamps
-        for event_type, events in schedule_data.items():
-            if not events:
-                continue
-            for event in events:
-                start_dt = self._parse_datetime(event.get('start'))
-                end_dt = self._parse_datetime(event.get('end'))
-                if start_dt and end_dt:
-                    all_events.append({
-                        'title': event.get('title', 'Untitled'),
-                        'start': start_dt,
-                        'end': end_dt,
-                        'type': event_type
-                    })
+            daily_events[date_key].sort(key=_BY_START)
         
         # Sort by start time
-        all_events.sort(key=lambda x: x['start'])
+        all_events.sort(key=_BY_START)
         
-        # Check for overlaps
-        for i in range(len(all_events)):
-            for j in range(i + 1, len(all_events)):
-                event_a = all_events[i]
-                event_b = all_events[j]
-                
-                # If event B starts before event A ends, they overlap
-                if event_b['start'] < event_a['end']:
-                    overlaps.append({
-                        'event1': event_a,
-                        'event2': event_b
-                    })
-                else:
-                    break  # No more overlaps possible for event_a
-        
-        return overlaps
+        # Check for overlaps. Events are sorted by start, so the events that
+        # overlap all_events[i] are exactly i+1 .. bisect(starts, end_i) - 1.
+        # That gives exact counts per event while only the pairs we display
+        # are materialized
+        starts = [event.start_dt for event in all_events]
+        overlaps = []
+        extra_count = 0
+        for i, event_a in enumerate(all_events):
+            hi = bisect_left(starts, event_a.end_dt, lo=i + 1)
+            count = hi - i - 1
+            if count <= 0:
+                continue
+            room = limit - len(overlaps)
+            for j in range(i + 1, i + 1 + min(room, count)):
+                overlaps.append({
+                    'event1': event_a,
+                    'event2': all_events[j]
+                })
+            extra_count += max(count - room, 0)
+        
+        return daily_events, overlaps, extra_count
     
-    def _create_overlap_warnings(self, overlaps: List[Dict]):
+    def _create_overlap_warnings(self, overlaps: List[Dict], extra_count: int = 0):
         """Create warnings table for overlapping events"""
         data = [['Time Conflict', 'Details']]
         
-        for overlap in overlaps[:10]:  # Limit to first 10
+        for overlap in overlaps:
             e1 = overlap['event1']
             e2 = overlap['event2']
             
-            time_str = f"{e1['start'].strftime('%a %b %d, %I:%M %p')}"
-            details = f"{e1['title']} ({e1['type']}) overlaps with {e2['title']} ({e2['type']})"
+            start_dt = e1.start_dt
+            time_str = (
+                f"{_WEEKDAY_ABBR[start_dt.weekday()]} {_MONTH_ABBR[start_dt.month - 1]} "
+                f"{start_dt.day:02d}, {_format_clock(start_dt)}"
+            )
+            details = (
+                f"{e1.title} ({e1.type}) overlaps with "
+                f"{e2.title} ({e2.type})"
+            )
             
             data.append([time_str, details])
         
-        if len(overlaps) > 10:
-            data.append(['...', f'And {len(overlaps) - 10} more conflicts'])
+        if extra_count:
+            data.append(['...', f'And {extra_count} more conflicts'])
         
         table = Table(data, colWidths=[2*inch, 4.5*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#E53935')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.HexColor('#ffebee'), colors.HexColor('#ffcdd2')]),
-            ('PADDING', (0, 0), (-1, -1), 6),
-        ]))
+        table.setStyle(self._OVERLAP_STYLE)
         
         return table
     
-    def _create_day_section(self, date_str: str, events: List[Dict]):
+    def _create_day_section(self, day: date, events: List[_Event]):
         """Create a section for one day's schedule"""
         elements = []
         
         # Day header
-        try:
-            date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-            day_title = date_obj.strftime('%A, %B %d, %Y')
-        except:
-            day_title = date_str
-        
+        day_title = day.strftime('%A, %B %d, %Y')
         elements.append(Paragraph(day_title, self.day_heading_style))
         
-        # Create table data
-        data = [['Time', 'Event', 'Type', 'Duration']]
+        # Create table rows, collecting each row's color alongside
+        rows = []
+        row_colors = []
         
-        for event in events:
-            start_dt = event.get('start_dt')
-            end_dt = event.get('end_dt')
-            
-            time_str = start_dt.strftime('%I:%M %p') if start_dt else 'TBD'
-            if end_dt:
-                time_str += f" - {end_dt.strftime('%I:%M %p')}"
-            
-            title = event.get('title', 'Untitled')
-            event_type = self._format_type(event.get('type', ''))
-            
-            # Calculate duration
+        for title, start_dt, end_dt, raw_type in events:
+            time_str = _format_clock(start_dt)
             duration = ''
-            if start_dt and end_dt:
-                delta = end_dt - start_dt
-                hours = delta.seconds // 3600
-                minutes = (delta.seconds % 3600) // 60
+            if end_dt:
+                time_str += f" - {_format_clock(end_dt)}"
+                
+                # Calculate duration (total_seconds so multi-day spans keep their days)
+                hours, minutes = divmod(max(int((end_dt - start_dt).total_seconds()), 0) // 60, 60)
                 if hours > 0:
                     duration = f"{hours}h {minutes}m" if minutes > 0 else f"{hours}h"
                 else:
                     duration = f"{minutes}m"
             
-            # Get color for event type
-            bg_color = self._get_type_color(event.get('type', ''))
+            rows.append([time_str, title, self._format_type(raw_type), duration])
+            row_colors.append(self._get_type_color(raw_type))
+        
+        # Create tables: the header goes on the first chunk only, so short
+        # days still render as a single table
+        col_widths = [2*inch, 2.5*inch, 1*inch, 1*inch]
+        for offset in range(0, max(len(rows), 1), DAY_TABLE_CHUNK_ROWS):
+            end = offset + DAY_TABLE_CHUNK_ROWS
+            if offset == 0:
+                data = [['Time', 'Event', 'Type', 'Duration']] + rows[:end]
+                parent, first_row = self._DAY_STYLE, 1
+            else:
+                data = rows[offset:end]
+                parent, first_row = self._DAY_BODY_STYLE, 0
             
-            data.append([time_str, title, event_type, duration])
-        
-        # Create table
-        table = Table(data, colWidths=[2*inch, 2.5*inch, 1*inch, 1*inch])
-        
-        style_commands = [
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#424242')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('PADDING', (0, 0), (-1, -1), 6),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]
-        
-        # Add row-specific coloring
-        for i, event in enumerate(events, start=1):
-            bg_color = self._get_type_color(event.get('type', ''))
-            style_commands.append(('BACKGROUND', (0, i), (-1, i), bg_color))
-        
-        table.setStyle(TableStyle(style_commands))
+            table = Table(data, colWidths=col_widths)
+            
+            # Shared base style plus row-specific coloring
+            row_commands = [
+                ('BACKGROUND', (0, i), (-1, i), color)
+                for i, color in enumerate(row_colors[offset:end], start=first_row)
+            ]
+            table.setStyle(TableStyle(row_commands, parent=parent))
+            elements.append(table)
         
-        elements.append(table)
         elements.append(Spacer(1, 0.2*inch))
         
         return elements
     
     def _create_courses_summary(self, courses: List[Dict]):
         """Create summary table for courses"""
-        # Group courses by title
-        course_groups = defaultdict(list)
-        for course in courses:
-            title = course.get('title', 'Untitled')
-            course_groups[title].append(course)
-        
         data = [['Course', 'Schedule']]
         
-        for title, instances in sorted(course_groups.items()):
+        for title, instances in _group_by_title(courses):
             times = []
             for course in instances:
                 start_dt = self._parse_datetime(course.get('start'))
                 if start_dt:
-                    day = start_dt.strftime('%a')
-                    time = start_dt.strftime('%I:%M %p')
+                    day = _WEEKDAY_ABBR[start_dt.weekday()]
+                    time = _format_clock(start_dt)
                     times.append(f"{day} {time}")
             
-            schedule = ', '.join(sorted(set(times))[:5])  # Limit display
+            schedule = ', '.join(nsmallest(5, set(times)))  # Limit display
             if len(times) > 5:
                 schedule += '...'
             
@@ -330,14 +486,9 @@ class PDFScheduleGenerator:
     
     def _create_jobs_summary(self, jobs: List[Dict]):
         """Create summary table for jobs"""
-        job_groups = defaultdict(list)
-        for job in jobs:
-            title = job.get('title', 'Untitled')
-            job_groups[title].append(job)
-        
         data = [['Job', 'Total Hours', 'Days']]
         
-        for title, instances in sorted(job_groups.items()):
+        for title, instances in _group_by_title(jobs):
             total_hours = 0
             days = set()
             
@@ -345,7 +496,7 @@ class PDFScheduleGenerator:
                 start_dt = self._parse_datetime(job.get('start'))
                 end_dt = self._parse_datetime(job.get('end'))
                 if start_dt and end_dt:
-                    days.add(start_dt.strftime('%a'))
+                    days.add(_WEEKDAY_ABBR[start_dt.weekday()])
                     delta = end_dt - start_dt
                     total_hours += delta.seconds / 3600
             
@@ -368,21 +519,7 @@ class PDFScheduleGenerator:
         
         legend_table = Table(legend_data, colWidths=[2*inch, 4*inch])
         
-        legend_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#424242')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-            ('BACKGROUND', (1, 1), (1, 1), colors.HexColor('#C8E6C9')),
-            ('BACKGROUND', (1, 2), (1, 2), colors.HexColor('#BBDEFB')),
-            ('BACKGROUND', (1, 3), (1, 3), colors.HexColor('#FFE0B2')),
-            ('BACKGROUND', (1, 4), (1, 4), colors.HexColor('#E1BEE7')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('PADDING', (0, 0), (-1, -1), 8),
-        ]))
+        legend_table.setStyle(self._LEGEND_STYLE)
         
         return legend_table
     
@@ -390,18 +527,7 @@ class PDFScheduleGenerator:
         """Create a styled table with given data and header color"""
         table = Table(data, colWidths=col_widths)
         
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(color)),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
-            ('PADDING', (0, 0), (-1, -1), 6),
-        ]))
+        table.setStyle(_summary_table_style(color))
         
         return table
     
@@ -413,35 +539,15 @@ class PDFScheduleGenerator:
         if isinstance(dt_str, datetime):
             return dt_str
         
-        try:
-            # Try ISO format
-            dt = datetime.fromisoformat(str(dt_str).replace('Z', '+00:00'))
-            # Convert to local time (remove timezone info for display)
-            return dt.replace(tzinfo=None)
-        except:
-            pass
-        
-        return None
+        return _parse_iso_string(str(dt_str))
     
     def _get_type_color(self, event_type: str):
         """Get background color for event type"""
-        colors_map = {
-            'tasks': colors.HexColor('#C8E6C9'),
-            'courses': colors.HexColor('#BBDEFB'),
-            'breaks': colors.HexColor('#FFE0B2'),
-            'jobs': colors.HexColor('#E1BEE7')
-        }
-        return colors_map.get(event_type, colors.white)
+        return self._TYPE_COLORS.get(event_type, colors.white)
     
     def _format_type(self, event_type: str) -> str:
         """Format event type for display"""
-        type_map = {
-            'tasks': 'Study',
-            'courses': 'Class',
-            'breaks': 'Break',
-            'jobs': 'Work'
-        }
-        return type_map.get(event_type, event_type.title())
+        return self._TYPE_LABELS.get(event_type, event_type.title())
 
 
 # FastAPI endpoint
@@ -458,10 +564,10 @@ async def generate_pdf(schedule_data: dict):
     """Generate PDF from schedule data"""
     try:
         generator = PDFScheduleGenerator()
-        pdf_buffer = generator.generate(schedule_data)
+        pdf_stream = generator.generate_stream(schedule_data)
         
         return StreamingResponse(
-            pdf_buffer,
+            pdf_stream,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename=StudyTime_Schedule_{datetime.now().strftime('%Y%m%d')}.pdf"
@@ -6,9 +6,11 @@ Respects user preferences while maintaining intelligent scheduling.
 Supports three modes: Relaxed, Balanced, and Urgent.
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, time as time_of_day
 from typing import List, Dict, Tuple, Optional
-from collections import defaultdict
+from collections import Counter, defaultdict
+from functools import lru_cache
+import heapq
 import logging
 import math
 
@@ -32,6 +34,10 @@ DEFAULT_WAKE = "08:00"
 DEFAULT_SLEEP = "23:00"
 MIN_USABLE_BLOCK = 20
 
+# Kinds of busy block, so gap classification compares tags instead of
+# searching display labels
+BLOCK_CLASS, BLOCK_WORK, BLOCK_BREAK, BLOCK_COMMUTE, BLOCK_MEAL = range(5)
+
 
 # ============================================
 # User Preferences Helper
@@ -75,41 +81,101 @@ def get_user_preferences(payload: Dict) -> Dict:
 # Timezone-Aware Time Functions
 # ============================================
 
+@lru_cache(maxsize=16)
+def _get_tz(timezone_str: str):
+    """ZoneInfo for a timezone name, or None if it is unknown or zoneinfo is unavailable"""
+    if ZoneInfo is None:
+        return None
+    try:
+        return ZoneInfo(timezone_str)
+    except (ValueError, KeyError, TypeError):
+        # ZoneInfoNotFoundError is a KeyError; malformed keys raise ValueError
+        return None
+
+
 def get_aware_now(timezone_str: str = "America/New_York") -> datetime:
     """Get timezone-aware current datetime"""
-    if ZoneInfo:
-        try:
-            tz = ZoneInfo(timezone_str)
-            return datetime.now(tz)
-        except:
-            pass
-    return datetime.now()
+    try:
+        tz = _get_tz(timezone_str)
+    except TypeError:
+        # Unhashable preference value
+        tz = None
+    return datetime.now(tz) if tz else datetime.now()
+
+
+@lru_cache(maxsize=256)
+def _parse_hm_cached(t: str) -> Tuple[int, int]:
+    try:
+        h, m = map(int, t.split(":"))
+        time_of_day(h, m)  # range check
+        return h, m
+    except (ValueError, AttributeError, TypeError):
+        # Wrong shape, non-numeric or out-of-range parts, or not a string
+        return 8, 0
+
+
+def parse_hm(t: str) -> Tuple[int, int]:
+    """Parse HH:MM time string into (hour, minute), falling back to 08:00"""
+    # Payloads repeat the same handful of times, so parse each string once
+    try:
+        return _parse_hm_cached(t)
+    except TypeError:
+        # Unhashable value; it would not have parsed either
+        return 8, 0
+
+
+def minute_of_day(t: str) -> int:
+    """Parse HH:MM time string into minutes after midnight, falling back to 08:00"""
+    h, m = parse_hm(t)
+    return h * 60 + m
+
+
+def at_time(date: datetime, hm: Tuple[int, int]) -> datetime:
+    """Datetime at (hour, minute) on the given date, in the date's timezone"""
+    return datetime(date.year, date.month, date.day, hm[0], hm[1], tzinfo=date.tzinfo)
+
+
+def at_minute(date: datetime, minute: int) -> datetime:
+    """Datetime at a minute-of-day on the given date"""
+    return at_time(date, divmod(minute, 60))
+
+
+def format_hm(dt: datetime) -> str:
+    """HH:MM, same as strftime("%H:%M") without the format parsing"""
+    return f"{dt.hour:02d}:{dt.minute:02d}"
+
+
+def format_mdy(dt: datetime) -> str:
+    """MM/DD/YYYY, same as strftime("%m/%d/%Y") without the format parsing"""
+    return f"{dt.month:02d}/{dt.day:02d}/{dt.year}"
 
 
 def parse_time(date: datetime, t: str) -> datetime:
     """Parse HH:MM time string into datetime on given date"""
+    return at_time(date, parse_hm(t))
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso_cached(dt_str: str) -> Optional[datetime]:
     try:
-        h, m = map(int, t.split(":"))
-        result = datetime(date.year, date.month, date.day, h, m)
-        if hasattr(date, 'tzinfo') and date.tzinfo:
-            result = result.replace(tzinfo=date.tzinfo)
-        return result
-    except:
-        result = datetime(date.year, date.month, date.day, 8, 0)
-        if hasattr(date, 'tzinfo') and date.tzinfo:
-            result = result.replace(tzinfo=date.tzinfo)
-        return result
+        return datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
+    except (ValueError, AttributeError, TypeError):
+        return None
 
 
 def parse_datetime_aware(dt_str: str, reference_tz: datetime) -> datetime:
     """Parse ISO datetime string"""
+    # Due dates repeat across tasks and refreshes; parse each string once
     try:
-        dt = datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
-        if dt.tzinfo is None and hasattr(reference_tz, 'tzinfo') and reference_tz.tzinfo:
-            dt = dt.replace(tzinfo=reference_tz.tzinfo)
-        return dt
-    except:
+        dt = _parse_iso_cached(dt_str)
+    except TypeError:
+        # Unhashable value; it would not have parsed either
+        dt = None
+    if dt is None:
         return reference_tz + timedelta(days=7)
+    if dt.tzinfo is None and hasattr(reference_tz, 'tzinfo') and reference_tz.tzinfo:
+        dt = dt.replace(tzinfo=reference_tz.tzinfo)
+    return dt
 
 
 def minutes_between(a: datetime, b: datetime) -> int:
@@ -121,169 +187,232 @@ def minutes_between(a: datetime, b: datetime) -> int:
 # Schedule Analysis with Auto-Meals
 # ============================================
 
-def get_day_schedule(date: datetime, payload: Dict, prefs: Dict) -> List[Tuple[datetime, datetime, str]]:
-    """Get ALL busy blocks for a day, including auto-meals"""
-    day_name = WEEKDAY_NAMES[date.weekday()]
-    busy_blocks = []
-    
-    # Add courses
+def build_week_template(payload: Dict, prefs: Dict) -> List[List[Tuple[int, int, str, int]]]:
+    """
+    Busy blocks for each weekday (Monday first) as (start, end, label, kind),
+    with times in minutes of the day, including auto-meals. Every activity's
+    times are parsed once here instead of once per date in the horizon.
+    """
+    recurring = []
     for c in payload.get("courses", []):
-        if day_name in c.get("days", []):
-            start = parse_time(date, c["start"])
-            end = parse_time(date, c["end"])
-            busy_blocks.append((start, end, f"Class: {c.get('name', 'Course')}"))
-    
-    # Add jobs
+        recurring.append((c.get("days", []), c["start"], c["end"], f"Class: {c.get('name', 'Course')}", BLOCK_CLASS))
     for j in payload.get("jobs", []):
-        if day_name in j.get("days", []):
-            start = parse_time(date, j["start"])
-            end = parse_time(date, j["end"])
-            busy_blocks.append((start, end, f"Work: {j.get('name', 'Job')}"))
-    
-    # Add breaks
+        recurring.append((j.get("days", []), j["start"], j["end"], f"Work: {j.get('name', 'Job')}", BLOCK_WORK))
     for b in payload.get("breaks", []):
-        if day_name == b.get("day"):
-            start = parse_time(date, b["start"])
-            end = parse_time(date, b["end"])
-            busy_blocks.append((start, end, f"Break: {b.get('name', 'Break')}"))
-    
-    # Add commutes
+        recurring.append(((b.get("day"),), b["start"], b["end"], f"Break: {b.get('name', 'Break')}", BLOCK_BREAK))
     for ct in payload.get("commutes", []):
-        if day_name in ct.get("days", []):
-            start = parse_time(date, ct["start"])
-            end = parse_time(date, ct["end"])
-            busy_blocks.append((start, end, f"Commute: {ct.get('name', 'Commute')}"))
+        recurring.append((ct.get("days", []), ct["start"], ct["end"], f"Commute: {ct.get('name', 'Commute')}", BLOCK_COMMUTE))
+    
+    parsed = [
+        (days, minute_of_day(start), minute_of_day(end), label, kind)
+        for days, start, end, label, kind in recurring
+    ]
     
     # Auto-add meal times if enabled
+    meals = []
     if prefs.get("autoMeals", True):
-        lunch_start = parse_time(date, prefs.get("lunchStart", "12:00"))
-        lunch_end = parse_time(date, prefs.get("lunchEnd", "13:00"))
-        dinner_start = parse_time(date, prefs.get("dinnerStart", "18:00"))
-        dinner_end = parse_time(date, prefs.get("dinnerEnd", "19:00"))
-        
-        busy_blocks.append((lunch_start, lunch_end, "Lunch"))
-        busy_blocks.append((dinner_start, dinner_end, "Dinner"))
+        meals.append((minute_of_day(prefs.get("lunchStart", "12:00")), minute_of_day(prefs.get("lunchEnd", "13:00")), "Lunch", BLOCK_MEAL))
+        meals.append((minute_of_day(prefs.get("dinnerStart", "18:00")), minute_of_day(prefs.get("dinnerEnd", "19:00")), "Dinner", BLOCK_MEAL))
     
-    busy_blocks.sort(key=lambda x: x[0])
-    return busy_blocks
+    week = []
+    for day_name in WEEKDAY_NAMES:
+        blocks = [(start, end, label, kind) for days, start, end, label, kind in parsed if day_name in days]
+        blocks.extend(meals)
+        # Same-day times share a tzinfo, so minute order is datetime order
+        blocks.sort(key=lambda x: x[0])
+        week.append(blocks)
+    return week
+
+
+def get_day_schedule(date: datetime, payload: Dict, prefs: Dict, week: Optional[List] = None) -> List[Tuple[datetime, datetime, str, int]]:
+    """Get ALL busy blocks for a day, including auto-meals"""
+    if week is None:
+        week = build_week_template(payload, prefs)
+    return [(at_minute(date, start), at_minute(date, end), label, kind) for start, end, label, kind in week[date.weekday()]]
 
 
 # ============================================
 # Gap Finding with User Preferences
 # ============================================
 
-def find_gaps(date: datetime, payload: Dict, prefs: Dict, now: datetime) -> List[Dict]:
-    """Find ALL free gaps in a day with user preferences applied"""
-    wake = prefs.get("wake", DEFAULT_WAKE)
-    sleep = prefs.get("sleep", DEFAULT_SLEEP)
-    
-    day_start = parse_time(date, wake)
-    day_end = parse_time(date, sleep)
-    
-    # Skip past days
-    if date.date() < now.date():
-        return []
-    
-    # Check if weekend
-    is_weekend = date.weekday() >= 5
-    if is_weekend and not prefs.get("weekendStudy", True):
-        return []
-    
-    is_today = date.date() == now.date()
-    
-    if is_today:
-        # TODAY: Start from NOW
-        day_start = max(day_start, now)
-        
-        if day_start >= day_end:
-            return []
-        
-        logger.info(f"🕐 NOW: {now.strftime('%I:%M %p')} → Finding gaps until {day_end.strftime('%I:%M %p')}")
-    
-    busy_blocks = get_day_schedule(date, payload, prefs)
-    
-    gaps = []
+class Gap:
+    """A free stretch of time on one day that study sessions can be placed in"""
+    
+    __slots__ = ("date", "start", "end", "duration", "before", "after", "is_today", "is_weekend",
+                 "is_between_classes", "is_after_school", "hours_from_now", "alive")
+    
+    def __init__(self, date, start, end, duration, before, after, is_today, is_weekend,
+                 is_between_classes, is_after_school, hours_from_now):
+        self.date = date
+        self.start = start
+        self.end = end
+        self.duration = duration
+        self.before = before
+        self.after = after
+        self.is_today = is_today
+        self.is_weekend = is_weekend
+        self.is_between_classes = is_between_classes
+        self.is_after_school = is_after_school
+        self.hours_from_now = hours_from_now
+        self.alive = True
+
+
+def _scan_free_spans(day_start, day_end, busy_blocks, first_before: str, minutes) -> List[Tuple]:
+    """
+    Walk a day's sorted busy blocks and return the usable free spans as
+    (start, end, duration, before, after, is_between_classes, is_after_school).
+    
+    Times may be datetimes or plain minutes of the day; `minutes(a, b)` gives
+    the length of a span in either representation.
+    """
+    spans = []
     current_time = day_start
     
-    for i, (busy_start, busy_end, busy_type) in enumerate(busy_blocks):
+    for i, (busy_start, busy_end, busy_type, busy_kind) in enumerate(busy_blocks):
         # Skip past activities
         if busy_end <= current_time:
             continue
         
         # Gap before this busy block?
         if current_time < busy_start:
-            gap_duration = minutes_between(current_time, busy_start)
+            gap_duration = minutes(current_time, busy_start)
             
             if gap_duration >= MIN_USABLE_BLOCK:
-                before = busy_blocks[i-1][2] if i > 0 else ("now" if is_today else "start")
+                before = busy_blocks[i-1][2] if i > 0 else first_before
                 after = busy_type
                 
                 # Determine gap type
-                is_between_classes = "Class" in after and i > 0 and "Class" in busy_blocks[i-1][2]
-                is_after_school = i > 0 and "Class" in busy_blocks[i-1][2] and "Class" not in after
+                after_class = busy_kind == BLOCK_CLASS
+                before_class = i > 0 and busy_blocks[i-1][3] == BLOCK_CLASS
                 
-                gaps.append({
-                    "date": date,
-                    "start": current_time,
-                    "end": busy_start,
-                    "duration": gap_duration,
-                    "before": before,
-                    "after": after,
-                    "is_today": is_today,
-                    "is_weekend": is_weekend,
-                    "is_between_classes": is_between_classes,
-                    "is_after_school": is_after_school,
-                    "hours_from_now": (current_time - now).total_seconds() / 3600,
-                })
+                spans.append((current_time, busy_start, gap_duration, before, after,
+                              after_class and before_class, before_class and not after_class))
         
         current_time = max(current_time, busy_end)
     
     # Gap after last activity
     if current_time < day_end:
-        gap_duration = minutes_between(current_time, day_end)
+        gap_duration = minutes(current_time, day_end)
         if gap_duration >= MIN_USABLE_BLOCK:
-            before = busy_blocks[-1][2] if busy_blocks else ("now" if is_today else "start")
+            before = busy_blocks[-1][2] if busy_blocks else first_before
             
-            is_after_school = busy_blocks and any("Class" in b[2] for b in busy_blocks)
+            is_after_school = busy_blocks and any(b[3] == BLOCK_CLASS for b in busy_blocks)
             
-            gaps.append({
-                "date": date,
-                "start": current_time,
-                "end": day_end,
-                "duration": gap_duration,
-                "before": before,
-                "after": "sleep",
-                "is_today": is_today,
-                "is_weekend": is_weekend,
-                "is_between_classes": False,
-                "is_after_school": is_after_school,
-                "hours_from_now": (current_time - now).total_seconds() / 3600,
-            })
-    
-    return gaps
-
-
-def build_gap_inventory(start_date: datetime, end_date: datetime, payload: Dict, prefs: Dict) -> List[Dict]:
+            spans.append((current_time, day_end, gap_duration, before, "sleep",
+                          False, is_after_school))
+    
+    return spans
+
+
+def _minute_span(a: int, b: int) -> int:
+    return b - a
+
+
+def build_week_free_spans(week: List, prefs: Dict) -> List[List[Tuple]]:
+    """
+    Free spans for each weekday of a week template, in minutes of the day.
+    Every date after today with the same weekday has the same spans, so a
+    multi-week horizon scans each weekday once.
+    """
+    day_start = minute_of_day(prefs.get("wake", DEFAULT_WAKE))
+    day_end = minute_of_day(prefs.get("sleep", DEFAULT_SLEEP))
+    return [_scan_free_spans(day_start, day_end, blocks, "start", _minute_span) for blocks in week]
+
+
+def find_gaps(date: datetime, payload: Dict, prefs: Dict, now: datetime, week: Optional[List] = None,
+              week_spans: Optional[List] = None) -> List[Gap]:
+    """Find ALL free gaps in a day with user preferences applied"""
+    wake = prefs.get("wake", DEFAULT_WAKE)
+    sleep = prefs.get("sleep", DEFAULT_SLEEP)
+    
+    # Skip past days
+    if date.date() < now.date():
+        return []
+    
+    # Check if weekend
+    is_weekend = date.weekday() >= 5
+    if is_weekend and not prefs.get("weekendStudy", True):
+        return []
+    
+    is_today = date.date() == now.date()
+    
+    if is_today:
+        # TODAY: Start from NOW, which is not minute-aligned, so scan datetimes
+        day_start = max(parse_time(date, wake), now)
+        day_end = parse_time(date, sleep)
+        
+        if day_start >= day_end:
+            return []
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("🕐 NOW: %s → Finding gaps until %s", now.strftime('%I:%M %p'), day_end.strftime('%I:%M %p'))
+        
+        busy_blocks = get_day_schedule(date, payload, prefs, week)
+        spans = _scan_free_spans(day_start, day_end, busy_blocks, "now", minutes_between)
+    else:
+        # Later days: take the weekday's free spans in whole minutes and
+        # only build datetimes for the gaps that come out
+        if week_spans is None:
+            if week is None:
+                week = build_week_template(payload, prefs)
+            week_spans = build_week_free_spans(week, prefs)
+        spans = [
+            (at_minute(date, start), at_minute(date, end), *rest)
+            for start, end, *rest in week_spans[date.weekday()]
+        ]
+    
+    return [
+        Gap(date, start, end, duration, before, after, is_today, is_weekend,
+            is_between_classes, is_after_school, (start - now).total_seconds() / 3600)
+        for start, end, duration, before, after, is_between_classes, is_after_school in spans
+    ]
+
+
+def build_gap_inventory(start_date: datetime, end_date: datetime, payload: Dict, prefs: Dict) -> List[Gap]:
     """Build complete inventory of gaps with preferences"""
     all_gaps = []
     current = start_date.date()
     end = end_date.date()
+    week = build_week_template(payload, prefs)
+    week_spans = build_week_free_spans(week, prefs)
+    # find_gaps returns nothing for weekends then; don't build their dates
+    skip_weekends = not prefs.get("weekendStudy", True)
+    tz = start_date.tzinfo
     
     while current <= end:
-        date_obj = datetime.combine(current, datetime.min.time())
-        if hasattr(start_date, 'tzinfo') and start_date.tzinfo:
-            date_obj = date_obj.replace(tzinfo=start_date.tzinfo)
+        if skip_weekends and current.weekday() >= 5:
+            current += timedelta(days=1)
+            continue
+        
+        date_obj = datetime(current.year, current.month, current.day, tzinfo=tz)
         
-        day_gaps = find_gaps(date_obj, payload, prefs, start_date)
+        day_gaps = find_gaps(date_obj, payload, prefs, start_date, week, week_spans)
         all_gaps.extend(day_gaps)
         current += timedelta(days=1)
     
     # Sort by start time
-    all_gaps.sort(key=lambda g: g["start"])
+    all_gaps.sort(key=lambda g: g.start)
     
     return all_gaps
 
 
+def count_gaps_before(gaps: List[Gap], moment: datetime) -> int:
+    """
+    Number of leading gaps that start before `moment`.
+    
+    Live gaps never overlap and are only shrunk from the front, so the
+    inventory stays sorted by start and a binary search finds the cutoff.
+    """
+    lo, hi = 0, len(gaps)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if gaps[mid].start < moment:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
 # ============================================
 # Task Priority with Deadline Buffer
 # ============================================
@@ -292,7 +421,7 @@ def calculate_task_priority(task: Dict, now: datetime, prefs: Dict) -> Dict:
     """Calculate task urgency with deadline buffer"""
     try:
         deadline = parse_datetime_aware(task["due"], now)
-    except:
+    except KeyError:
         deadline = now + timedelta(days=7)
     
     # Apply deadline buffer
@@ -343,31 +472,52 @@ def calculate_task_priority(task: Dict, now: datetime, prefs: Dict) -> Dict:
 # Gap Scoring with Preferences
 # ============================================
 
-def score_gap_for_task(gap: Dict, task: Dict, urgency: Dict, prefs: Dict) -> float:
+def gap_scoring_context(task: Dict, urgency: Dict, prefs: Dict) -> Dict:
+    """Task- and preference-level inputs to score_gap_for_task, computed once per task"""
+    difficulty = task.get("difficulty", "Medium")
+    rules = DIFFICULTY_RULES[difficulty]
+    return {
+        "urgency_mode": prefs.get("urgencyMode", "balanced"),
+        "study_time_pref": prefs.get("studyTime", "any"),
+        "due_soon": urgency["is_due_today"] or urgency["is_due_tomorrow"],
+        "days_until_due": urgency["days_until_due"],
+        "between_classes_time": prefs.get("betweenClasses", 30),
+        "after_school_time": prefs.get("afterSchool", 120),
+        "task_duration": task.get("duration", 60),
+        "good_size": min(prefs.get("sessionLength", 60), rules["max"]),
+        "min_size": rules["min"],
+        "hard_in_morning": prefs.get("prioritizeHard", True) and difficulty == "Hard",
+    }
+
+
+def score_gap_for_task(gap: Gap, task: Dict, urgency: Dict, prefs: Dict, context: Optional[Dict] = None) -> float:
     """Score gaps based on user preferences and urgency mode"""
+    if context is None:
+        context = gap_scoring_context(task, urgency, prefs)
+    
     score = 0.0
-    urgency_mode = prefs.get("urgencyMode", "balanced")
-    study_time_pref = prefs.get("studyTime", "any")
+    urgency_mode = context["urgency_mode"]
+    study_time_pref = context["study_time_pref"]
     
     # FACTOR 1: TIME - Varies by urgency mode
-    hours_away = gap["hours_from_now"]
+    hours_away = gap.hours_from_now
     
     if urgency_mode == "urgent":
         # Urgent mode: Chronological is KING
         score += hours_away * 5
-        if gap["is_today"]:
+        if gap.is_today:
             score -= 500
     elif urgency_mode == "balanced":
         # Balanced: Mix of early and distributed
-        if urgency["is_due_today"] or urgency["is_due_tomorrow"]:
+        if context["due_soon"]:
             score += hours_away * 10
-            if gap["is_today"]:
+            if gap.is_today:
                 score -= 200
         else:
             score += hours_away * 5
     else:  # relaxed
         # Relaxed: Spread evenly
-        days_until_due = urgency["days_until_due"]
+        days_until_due = context["days_until_due"]
         if days_until_due > 3:
             score += abs(hours_away - (days_until_due * 24 / 2)) * 2
         else:
@@ -375,7 +525,7 @@ def score_gap_for_task(gap: Dict, task: Dict, urgency: Dict, prefs: Dict) -> flo
     
     # FACTOR 2: Preferred study time
     if study_time_pref != "any":
-        hour = gap["start"].hour
+        hour = gap.start.hour
         
         if study_time_pref == "morning" and 6 <= hour < 12:
             score -= 50
@@ -386,40 +536,35 @@ def score_gap_for_task(gap: Dict, task: Dict, urgency: Dict, prefs: Dict) -> flo
         else:
             score += 30  # Penalty for non-preferred time
     
+    gap_duration = gap.duration
+    
     # FACTOR 3: Between classes preference
-    if gap["is_between_classes"]:
-        between_classes_time = prefs.get("betweenClasses", 30)
-        if gap["duration"] >= between_classes_time:
+    if gap.is_between_classes:
+        if gap_duration >= context["between_classes_time"]:
             score -= 30  # Bonus for using between-class time
         else:
             score += 50  # Penalty if gap too small
     
     # FACTOR 4: After school preference
-    if gap["is_after_school"]:
-        after_school_time = prefs.get("afterSchool", 120)
-        if gap["duration"] >= after_school_time:
+    if gap.is_after_school:
+        if gap_duration >= context["after_school_time"]:
             score -= 40  # Bonus for after-school study
     
     # FACTOR 5: Can fit task?
-    task_duration = task.get("duration", 60)
-    if gap["duration"] >= task_duration:
+    if gap_duration >= context["task_duration"]:
         score -= 100
     
     # FACTOR 6: Appropriate gap size
-    difficulty = task.get("difficulty", "Medium")
-    rules = DIFFICULTY_RULES[difficulty]
-    session_length = prefs.get("sessionLength", 60)
-    
-    if gap["duration"] >= min(session_length, rules["max"]):
+    if gap_duration >= context["good_size"]:
         score -= 20
-    elif gap["duration"] >= rules["min"]:
+    elif gap_duration >= context["min_size"]:
         score += 10
     else:
         score += 100
     
     # FACTOR 7: Hard tasks in morning (if preference enabled)
-    if prefs.get("prioritizeHard", True) and difficulty == "Hard":
-        if gap["start"].hour < 12:
+    if context["hard_in_morning"]:
+        if gap.start.hour < 12:
             score -= 40
     
     return score
@@ -429,165 +574,194 @@ def score_gap_for_task(gap: Dict, task: Dict, urgency: Dict, prefs: Dict) -> flo
 # Task Scheduling with Preferences
 # ============================================
 
-def schedule_task_with_preferences(task: Dict, gaps: List[Dict], scheduled_blocks: List[Dict], 
-                                   now: datetime, prefs: Dict) -> List[Dict]:
-    """Schedule task respecting user preferences"""
+def schedule_task_with_preferences(task: Dict, gaps: List[Gap], scheduled_blocks: List[Dict], 
+                                   now: datetime, prefs: Dict, daily_study: Optional[Dict] = None) -> List[Dict]:
+    """
+    Schedule task respecting user preferences
+    
+    daily_study maps "MM/DD/YYYY" to minutes already scheduled that day. When
+    given it is updated in place, so a caller placing many tasks keeps one
+    running total instead of re-summing scheduled_blocks for every task.
+    """
     difficulty = task.get("difficulty", "Medium")
     rules = DIFFICULTY_RULES[difficulty]
     total_duration = task.get("duration", 60)
     remaining = total_duration
     
-    urgency = calculate_task_priority(task, now, prefs)
+    # generate_schedule has already ranked the task; reuse its urgency
+    urgency = task.get("_urgency") or calculate_task_priority(task, now, prefs)
     
     blocks = []
     session_num = 1
     
-    logger.info(f"\n📝 {task['name']}")
-    logger.info(f"   {total_duration}min | {difficulty} | Due: {urgency['adjusted_deadline'].strftime('%m/%d %I:%M%p')}")
+    # Session logging formats datetimes; skip that work when INFO is off
+    log_info = logger.isEnabledFor(logging.INFO)
+    
+    logger.info("\n📝 %s", task['name'])
+    if log_info:
+        logger.info("   %smin | %s | Due: %s", total_duration, difficulty, urgency['adjusted_deadline'].strftime('%m/%d %I:%M%p'))
     
     if urgency["is_due_today"]:
-        logger.info(f"   ⚠️ URGENT: Due in {urgency['hours_until_due']:.1f}h")
+        logger.info("   ⚠️ URGENT: Due in %.1fh", urgency['hours_until_due'])
     
     # Determine max session length
     max_session = min(prefs.get("sessionLength", 60), rules["max"])
+    min_session = rules["min"]
+    break_after_session = timedelta(minutes=prefs.get("breakDuration", 15))
+    
+    deadline = urgency["adjusted_deadline"]
+    
+    # Helper: Minutes of the gap before the deadline. gap.duration is kept
+    # equal to minutes_between(start, end), so it is reused unless the
+    # deadline cuts the gap short
+    def usable_minutes(gap):
+        if gap.end <= deadline:
+            return gap.duration
+        return minutes_between(gap.start, deadline)
     
     # Helper: Check if gap is usable
     def is_gap_usable(gap):
-        if gap["start"] < now:
+        if not gap.alive:
+            return False
+        if gap.start < now:
             return False
-        if gap["start"] >= urgency["adjusted_deadline"]:
+        if gap.start >= deadline:
             return False
-        usable_end = min(gap["end"], urgency["adjusted_deadline"])
-        return minutes_between(gap["start"], usable_end) >= MIN_USABLE_BLOCK
+        return usable_minutes(gap) >= MIN_USABLE_BLOCK
     
     # Check daily study limit
-    daily_study = defaultdict(int)
-    for block in scheduled_blocks:
-        date_key = block.get("date", "")
-        daily_study[date_key] += block.get("duration", 0)
+    if daily_study is None:
+        daily_study = defaultdict(int)
+        for block in scheduled_blocks:
+            date_key = block.get("date", "")
+            daily_study[date_key] += block.get("duration", 0)
     
     max_daily_minutes = prefs.get("maxStudyHours", 6) * 60
     
+    # Gaps starting at or after the deadline are never usable; skip them
+    candidate_gaps = gaps[:count_gaps_before(gaps, deadline)]
+    
     # PHASE 1: Try complete fit if auto-split is disabled
     if not prefs.get("autoSplit", True):
-        for gap in gaps[:]:
+        for gap in candidate_gaps:
             if not is_gap_usable(gap):
                 continue
             
-            usable_end = min(gap["end"], urgency["adjusted_deadline"])
-            usable_duration = minutes_between(gap["start"], usable_end)
+            usable_duration = usable_minutes(gap)
             
             if usable_duration >= remaining:
-                date_key = gap["start"].strftime("%m/%d/%Y")
+                date_key = format_mdy(gap.start)
                 if daily_study[date_key] + remaining <= max_daily_minutes:
-                    session_start = gap["start"]
+                    session_start = gap.start
                     session_end = session_start + timedelta(minutes=remaining)
                     
                     blocks.append({
                         "title": task["name"],
                         "day": WEEKDAY_NAMES[session_start.weekday()],
-                        "start": session_start.strftime("%H:%M"),
-                        "end": session_end.strftime("%H:%M"),
+                        "start": format_hm(session_start),
+                        "end": format_hm(session_end),
                         "date": date_key,
                         "duration": remaining,
                         "difficulty": difficulty,
                         "color": "#4CAF50",
                         "status": "scheduled",
+                        "task_id": task.get("id"),
                     })
                     
-                    logger.info(f"   ✓ Complete: {session_start.strftime('%a %m/%d %I:%M%p')}-{session_end.strftime('%I:%M%p')} ({remaining}min)")
+                    if log_info:
+                        logger.info("   ✓ Complete: %s-%s (%smin)", session_start.strftime('%a %m/%d %I:%M%p'), session_end.strftime('%I:%M%p'), remaining)
+                    daily_study[date_key] += remaining
                     
                     # Update gap
-                    if session_end >= gap["end"]:
-                        gaps.remove(gap)
+                    if session_end >= gap.end:
+                        gap.alive = False
                     else:
-                        gap["start"] = session_end
-                        gap["duration"] = minutes_between(session_end, gap["end"])
-                        gap["hours_from_now"] = (gap["start"] - now).total_seconds() / 3600
-                        if gap["duration"] < MIN_USABLE_BLOCK:
-                            gaps.remove(gap)
+                        gap.start = session_end
+                        gap.duration = minutes_between(session_end, gap.end)
+                        gap.hours_from_now = (gap.start - now).total_seconds() / 3600
+                        if gap.duration < MIN_USABLE_BLOCK:
+                            gap.alive = False
                     
                     return blocks
     
     # PHASE 2: Split into sessions
-    logger.info(f"   → Splitting into sessions (max {max_session}min each)")
-    
-    # Score all usable gaps
-    scored_gaps = []
-    for gap in gaps:
-        if is_gap_usable(gap):
-            score = score_gap_for_task(gap, task, urgency, prefs)
-            scored_gaps.append((score, gap))
-    
-    scored_gaps.sort(key=lambda x: x[0])
-    
-    for score, gap in scored_gaps:
-        if remaining <= 0:
-            break
+    logger.info("   → Splitting into sessions (max %smin each)", max_session)
+    
+    # Score all usable gaps once. Most tasks finish within a few sessions,
+    # so pop the best gaps off a heap instead of sorting every score; the
+    # index breaks ties in gap order, as the stable sort did
+    scoring_context = gap_scoring_context(task, urgency, prefs)
+    scored_gaps = [
+        (score_gap_for_task(gap, task, urgency, prefs, scoring_context), i, gap)
+        for i, gap in enumerate(candidate_gaps)
+        if is_gap_usable(gap)
+    ]
+    heapq.heapify(scored_gaps)
+    
+    # Each gap is pushed once and only changes after it is popped, so the
+    # usability checks made while scoring still hold when it comes off
+    while scored_gaps and remaining > 0:
+        score, _, gap = heapq.heappop(scored_gaps)
         
-        if not is_gap_usable(gap) or gap not in gaps:
-            continue
-        
-        date_key = gap["start"].strftime("%m/%d/%Y")
+        date_key = format_mdy(gap.start)
         if daily_study[date_key] >= max_daily_minutes:
             continue
         
-        usable_end = min(gap["end"], urgency["adjusted_deadline"])
-        available = minutes_between(gap["start"], usable_end)
-        
-        if available < MIN_USABLE_BLOCK:
-            continue
+        available = usable_minutes(gap)
         
         # Determine chunk size
         remaining_daily = max_daily_minutes - daily_study[date_key]
         chunk = min(remaining, available, max_session, remaining_daily)
         
-        if chunk < rules["min"] and remaining > rules["min"]:
+        if chunk < min_session and remaining > min_session:
             if chunk < MIN_USABLE_BLOCK:
                 continue
         
-        session_start = gap["start"]
+        session_start = gap.start
         session_end = session_start + timedelta(minutes=chunk)
         
         blocks.append({
             "title": f"{task['name']} (Part {session_num})",
             "day": WEEKDAY_NAMES[session_start.weekday()],
-            "start": session_start.strftime("%H:%M"),
-            "end": session_end.strftime("%H:%M"),
+            "start": format_hm(session_start),
+            "end": format_hm(session_end),
             "date": date_key,
             "duration": chunk,
             "difficulty": difficulty,
             "color": "#4CAF50",
             "status": "scheduled",
+            "task_id": task.get("id"),
         })
         
-        logger.info(f"   ✓ Part {session_num}: {session_start.strftime('%a %m/%d %I:%M%p')}-{session_end.strftime('%I:%M%p')} ({chunk}min)")
+        if log_info:
+            logger.info("   ✓ Part %s: %s-%s (%smin)", session_num, session_start.strftime('%a %m/%d %I:%M%p'), session_end.strftime('%I:%M%p'), chunk)
         
         remaining -= chunk
         session_num += 1
         daily_study[date_key] += chunk
         
         # Update gap
-        if session_end >= gap["end"]:
-            gaps.remove(gap)
+        if session_end >= gap.end:
+            gap.alive = False
         else:
-            gap["start"] = session_end + timedelta(minutes=prefs.get("breakDuration", 15))
-            gap["duration"] = minutes_between(gap["start"], gap["end"])
-            gap["hours_from_now"] = (gap["start"] - now).total_seconds() / 3600
-            if gap["duration"] < MIN_USABLE_BLOCK:
-                gaps.remove(gap)
+            gap.start = session_end + break_after_session
+            gap.duration = minutes_between(gap.start, gap.end)
+            gap.hours_from_now = (gap.start - now).total_seconds() / 3600
+            if gap.duration < MIN_USABLE_BLOCK:
+                gap.alive = False
     
     if remaining > 0:
-        logger.warning(f"   ⚠️ Could not schedule {remaining}min")
+        logger.warning("   ⚠️ Could not schedule %smin", remaining)
         blocks.append({
             "title": f"⚠️ {task['name']} (INCOMPLETE: {remaining}min)",
             "day": WEEKDAY_NAMES[urgency["adjusted_deadline"].weekday()],
-            "start": urgency["adjusted_deadline"].strftime("%H:%M"),
-            "end": urgency["adjusted_deadline"].strftime("%H:%M"),
-            "date": urgency["adjusted_deadline"].strftime("%m/%d/%Y"),
+            "start": format_hm(urgency["adjusted_deadline"]),
+            "end": format_hm(urgency["adjusted_deadline"]),
+            "date": format_mdy(urgency["adjusted_deadline"]),
             "duration": 0,
             "color": "#FF5722",
             "status": "incomplete",
+            "task_id": task.get("id"),
         })
     
     return blocks
@@ -601,18 +775,19 @@ def schedule_in_class_exam(task: Dict, payload: Dict, now: datetime) -> List[Dic
     """Schedule in-class exam"""
     try:
         exam_date = parse_datetime_aware(task["due"], now)
-    except:
+    except KeyError:
         exam_date = now
     
     return [{
         "title": f"📝 {task['name']}",
         "day": WEEKDAY_NAMES[exam_date.weekday()],
-        "start": exam_date.strftime("%H:%M"),
-        "end": (exam_date + timedelta(hours=1)).strftime("%H:%M"),
-        "date": exam_date.strftime("%m/%d/%Y"),
+        "start": format_hm(exam_date),
+        "end": format_hm((exam_date + timedelta(hours=1))),
+        "date": format_mdy(exam_date),
         "duration": 60,
         "color": "#E91E63",
         "status": "exam",
+        "task_id": task.get("id"),
     }]
 
 
@@ -620,18 +795,58 @@ def schedule_in_class_exam(task: Dict, payload: Dict, now: datetime) -> List[Dic
 # Main Scheduler
 # ============================================
 
+def _recurring_view(row) -> Dict:
+    """Minimal scheduler view of a course/job/commute row"""
+    return {"name": row.name, "days": row.days, "start": row.start, "end": row.end}
+
+
+def _break_view(row) -> Dict:
+    """Minimal scheduler view of a break row"""
+    return {"name": row.name, "day": row.day, "start": row.start, "end": row.end}
+
+
+def _task_view(row) -> Dict:
+    """Minimal scheduler view of a task row"""
+    return {
+        "id": row.id,
+        "name": row.name,
+        "duration": row.duration,
+        "due": row.due,
+        "difficulty": row.difficulty,
+        "is_exam": row.is_exam,
+    }
+
+
+def generate_schedule_from_orm(courses, tasks, breaks, jobs, commutes, preferences: Dict) -> Dict:
+    """
+    Schedule directly from ORM rows, reading only the columns the scheduler
+    uses instead of serializing every row with to_dict()
+    """
+    payload = {
+        "courses": [_recurring_view(c) for c in courses],
+        "tasks": [_task_view(t) for t in tasks],
+        "breaks": [_break_view(b) for b in breaks],
+        "jobs": [_recurring_view(j) for j in jobs],
+        "commutes": [_recurring_view(c) for c in commutes],
+        "preferences": preferences,
+    }
+    return generate_schedule(payload)
+
+
 def generate_schedule(payload: Dict) -> Dict:
     """Main scheduling engine with full personalization support"""
     prefs = get_user_preferences(payload)
     now = get_aware_now(prefs.get("timezone", "America/New_York"))
     
-    logger.info("=" * 70)
-    logger.info(f"🎓 StudyTime Personalized Scheduler")
-    logger.info(f"📅 {now.strftime('%A, %B %d, %Y')}")
-    logger.info(f"🕐 Current Time: {now.strftime('%I:%M %p')}")
-    logger.info(f"⚙️ Mode: {prefs.get('urgencyMode', 'balanced').upper()}")
-    logger.info(f"📚 Max Study: {prefs.get('maxStudyHours', 6)}h/day")
-    logger.info("=" * 70)
+    log_info = logger.isEnabledFor(logging.INFO)
+    if log_info:
+        logger.info("=" * 70)
+        logger.info("🎓 StudyTime Personalized Scheduler")
+        logger.info("📅 %s", now.strftime('%A, %B %d, %Y'))
+        logger.info("🕐 Current Time: %s", now.strftime('%I:%M %p'))
+        logger.info("⚙️ Mode: %s", prefs.get('urgencyMode', 'balanced').upper())
+        logger.info("📚 Max Study: %sh/day", prefs.get('maxStudyHours', 6))
+        logger.info("=" * 70)
     
     tasks = payload.get("tasks", [])
     if not tasks:
@@ -663,37 +878,43 @@ def generate_schedule(payload: Dict) -> Dict:
     max_deadline = max(t["_urgency"]["adjusted_deadline"] for t in study_tasks)
     
     # Build gap inventory
-    logger.info(f"\n🔍 Finding available time until {max_deadline.strftime('%m/%d')}...")
+    if log_info:
+        logger.info("\n🔍 Finding available time until %s...", max_deadline.strftime('%m/%d'))
     all_gaps = build_gap_inventory(now, max_deadline, payload, prefs)
     
-    logger.info(f"\n📊 Found {len(all_gaps)} available time slots")
+    logger.info("\n📊 Found %d available time slots", len(all_gaps))
     
     # Schedule each task
-    logger.info(f"\n" + "="*70)
+    logger.info("\n" + "="*70)
     logger.info("SCHEDULING TASKS:")
     logger.info("="*70)
     
     all_blocks = []
+    daily_study = defaultdict(int)
     for task in study_tasks:
-        task_blocks = schedule_task_with_preferences(task, all_gaps, all_blocks, now, prefs)
+        task_blocks = schedule_task_with_preferences(task, all_gaps, all_blocks, now, prefs, daily_study)
         all_blocks.extend(task_blocks)
+        # Used-up gaps are only flagged while a task is placed; drop them
+        # before the next task scores what is left
+        all_gaps[:] = [gap for gap in all_gaps if gap.alive]
     
     # Combine events
     all_events = exam_blocks + all_blocks
     
     # Stats
+    status_counts = Counter(b.get("status") for b in all_blocks)
     stats = {
         "total_tasks": len(tasks),
-        "scheduled": len([b for b in all_blocks if b.get("status") == "scheduled"]),
-        "incomplete": len([b for b in all_blocks if b.get("status") == "incomplete"]),
+        "scheduled": status_counts["scheduled"],
+        "incomplete": status_counts["incomplete"],
         "exams": len(exam_blocks),
     }
     
     logger.info("\n" + "="*70)
     logger.info("✅ SCHEDULING COMPLETE")
-    logger.info(f"   Scheduled: {stats['scheduled']}/{len(study_tasks)} tasks")
+    logger.info("   Scheduled: %d/%d tasks", stats['scheduled'], len(study_tasks))
     if stats["incomplete"] > 0:
-        logger.info(f"   ⚠️ Incomplete: {stats['incomplete']}")
+        logger.info("   ⚠️ Incomplete: %d", stats['incomplete'])
     logger.info("="*70)
     
     return {"events": all_events, "summary": stats}
\ No newline at end of file